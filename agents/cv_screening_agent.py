@@ -1,27 +1,45 @@
 from crewai import Agent
-from langchain_mistralai.chat_models import ChatMistralAI
-from utils.db import DBManager
+from utils.llm import get_llm
+from utils.db import get_db_manager
+from utils.embedding_cache import get_embedding_function
+from utils.skills import SkillMatcher, candidate_skill_tokens
+from utils.scoring import score_candidates, recommendation_for
+from utils.query_filters import build_where, resolve_filters, describe_filters
 from crewai.tools import BaseTool
-import os
+import time
 from typing import Optional, Dict, Any
 
 class CVSearchTool(BaseTool):
     name: str = "cv_search_tool"
-    description: str = "Searches and screens candidate profiles based on job requirements"
+    description: str = ("Searches and screens candidate profiles based on job requirements. "
+                        "Optional location, role, min_years, max_years and source narrow the search; "
+                        "when none are given they are read from the query.")
     
-    def _run(self, query: str, top_k: int = 5) -> str:
-        results = CVScreeningAgent.search_and_screen_profiles(query, top_k)
+    def _run(self, query: str, top_k: int = 5, location: Optional[str] = None, role: Optional[str] = None,
+             min_years: Optional[float] = None, max_years: Optional[float] = None,
+             source: Optional[str] = None) -> str:
+        filters = resolve_filters(query, location, role, min_years, max_years, source)
+        results = CVScreeningAgent.search_and_screen_profiles(query, top_k, filters=filters)
         return results
 
+class BulkCVScreeningTool(BaseTool):
+    name: str = "bulk_cv_screening_tool"
+    description: str = ("Scores a large candidate pool (default: top 1000 by similarity) against job "
+                        "requirements and returns a ranked shortlist")
+    
+    def _run(self, query: str, shortlist_size: int = 10, location: Optional[str] = None,
+             role: Optional[str] = None, min_years: Optional[float] = None, max_years: Optional[float] = None,
+             source: Optional[str] = None) -> str:
+        filters = resolve_filters(query, location, role, min_years, max_years, source)
+        return CVScreeningAgent.bulk_screen_profiles(query, shortlist_size=shortlist_size, filters=filters)
+
 class CVScreeningAgent:
     @staticmethod
     def agent():
-        llm = ChatMistralAI(
-            api_key=os.getenv("MISTRAL_API_KEY"),
-            model="mistral/mistral-large-latest"
-        )
+        llm = get_llm()
         
         cv_tool = CVSearchTool()
+        bulk_tool = BulkCVScreeningTool()
         
         return Agent(
             role="CV Screener",
@@ -30,33 +48,32 @@ class CVScreeningAgent:
             backstory="Highly skilled in analyzing CVs swiftly and accurately.",
             llm=llm,
             allow_delegation=False,
-            tools=[cv_tool]
+            tools=[cv_tool, bulk_tool]
         )
     
     @staticmethod
-    def search_and_screen_profiles(job_description, top_k=5):
+    def search_and_screen_profiles(job_description, top_k=5, filters=None):
         try:
-            db_manager = DBManager(path='data/chromadb_data')
-            collection = db_manager.get_collection("linkedin_profiles")
+            db_manager = get_db_manager()
             
-            results = collection.query(
+            results = db_manager.query(
+                "linkedin_profiles",
                 query_texts=[job_description],
-                n_results=top_k
+                n_results=top_k,
+                where=build_where(**filters) if filters else None
             )
             
             if not results or not results['ids'] or len(results['ids'][0]) == 0:
-                return "No matching profiles found in the database."
+                return f"No matching profiles found in the database (filters: {describe_filters(filters)})."
             
             screened_results = []
+            matcher = SkillMatcher(job_description)
             
             for i in range(len(results['ids'][0])):
                 doc_text = results['documents'][0][i] if i < len(results['documents'][0]) else "No document text available"
                 metadata = results['metadatas'][0][i] if i < len(results['metadatas'][0]) else {}
                 
-                job_keywords = job_description.lower().split()
-                
                 score = 0
-                skills = metadata.get('skills', '').lower()
                 years_exp = metadata.get('years_experience', '0')
                 
                 try:
@@ -66,11 +83,8 @@ class CVScreeningAgent:
                 
                 experience_score = min(40, int(years_exp * 8))
                 
-                skill_score = 0
-                for keyword in job_keywords:
-                    if keyword in skills and len(keyword) > 3:  
-                        skill_score += 5
-                skill_score = min(60, skill_score)
+                matched_skills = matcher.matches(candidate_skill_tokens(metadata))
+                skill_score = min(60, 5 * len(matched_skills))
                 
                 score = experience_score + skill_score
                 
@@ -81,28 +95,23 @@ class CVScreeningAgent:
                         field_name = field.replace('_', ' ').title()
                         evaluation += f"{field_name}: {metadata[field]}\n"
                 
+                if matched_skills:
+                    evaluation += f"Matched Skills: {', '.join(sorted(matched_skills))}\n"
+                
                 evaluation += f"\nEvaluation:\n"
                 evaluation += f"Experience Score: {experience_score}/40\n"
                 evaluation += f"Skills Match Score: {skill_score}/60\n"
                 evaluation += f"Overall Score: {score}/100\n"
                 
-                if score >= 80:
-                    recommendation = "Highly Recommended"
-                elif score >= 60:
-                    recommendation = "Recommended"
-                elif score >= 40:
-                    recommendation = "Consider for Interview"
-                else:
-                    recommendation = "Not Recommended"
-                
-                evaluation += f"Recommendation: {recommendation}\n"
+                evaluation += f"Recommendation: {recommendation_for(score)}\n"
                 
                 screened_results.append((score, evaluation))
             
             screened_results.sort(key=lambda x: x[0], reverse=True)
             
             final_output = " CV SCREENING RESULTS \n\n"
-            final_output += f"Screened {len(screened_results)} candidates from the database for job: {job_description}\n\n"
+            final_output += f"Screened {len(screened_results)} candidates from the database for job: {job_description}\n"
+            final_output += f"Filters applied: {describe_filters(filters)}\n\n"
             final_output += "Candidates Ranked by Suitability (DATABASE PROFILES ONLY):\n\n"
             
             for i, (score, evaluation) in enumerate(screened_results):
@@ -115,3 +124,134 @@ class CVScreeningAgent:
             
         except Exception as e:
             return f"Error screening profiles: {str(e)}"
+
+    @staticmethod
+    def bulk_screen_profiles(job_description, pool_size=1000, shortlist_size=10, similarity_weight=0.2, filters=None):
+        """Score up to `pool_size` nearest candidates (all when None) in one vectorized pass"""
+        try:
+            db_manager = get_db_manager()
+            collection = db_manager.get_collection("linkedin_profiles")
+            
+            available = collection.count()
+            if available == 0:
+                return "No matching profiles found in the database."
+            
+            n_results = available if pool_size is None else min(pool_size, available)
+            results = db_manager.query(
+                "linkedin_profiles",
+                query_texts=[job_description],
+                n_results=n_results,
+                where=build_where(**filters) if filters else None,
+                include=["metadatas", "distances"]
+            )
+            
+            if not results['ids'][0]:
+                return f"No matching profiles found in the database (filters: {describe_filters(filters)})."
+            
+            start = time.perf_counter()
+            ranked = score_candidates(
+                job_description,
+                results['ids'][0],
+                results['metadatas'][0],
+                distances=results['distances'][0],
+                similarity_weight=similarity_weight
+            )
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            
+            final_output = " BULK CV SCREENING RESULTS \n\n"
+            final_output += (f"Scored {len(ranked)} candidates in {elapsed_ms:.1f} ms for job: {job_description}\n"
+                             f"Blend: {100 * (1 - similarity_weight):.0f}% rule score, "
+                             f"{100 * similarity_weight:.0f}% vector similarity\n"
+                             f"Filters applied: {describe_filters(filters)}\n\n")
+            final_output += f"Top {min(shortlist_size, len(ranked))} Candidates (DATABASE PROFILES ONLY):\n\n"
+            
+            final_output += CVScreeningAgent.format_shortlist(ranked.head(shortlist_size))
+            
+            final_output += "DISCLAIMER: All profile information above comes directly from the database. No profile data has been generated or modified."
+            
+            return final_output
+            
+        except Exception as e:
+            return f"Error screening profiles: {str(e)}"
+
+    @staticmethod
+    def format_shortlist(shortlist):
+        output = ""
+        for rank, (_, row) in enumerate(shortlist.iterrows(), start=1):
+            output += f"Rank #{rank} (Score: {row['score']}/100) - {row.get('name', 'Unknown')}\n"
+            for field in ['role', 'location', 'skills', 'years_experience']:
+                if field in row and row[field]:
+                    output += f"{field.replace('_', ' ').title()}: {row[field]}\n"
+            if row['matched_skills']:
+                output += f"Matched Skills: {row['matched_skills']}\n"
+            output += (f"Experience Score: {row['experience_score']}/40, "
+                       f"Skills Match Score: {row['skill_score']}/60\n")
+            output += f"Recommendation: {row['recommendation']}\n\n"
+        return output
+
+    @staticmethod
+    def batch_screen_requisitions(job_descriptions, pool_size=200, shortlist_size=10, similarity_weight=0.2,
+                                  filters=None):
+        """Screen many job requisitions with one embedding call and one multi-query per distinct filter.
+
+        Each requisition uses `filters` when given, otherwise the constraints
+        parsed from its own text. Returns {job_description: ranked shortlist DataFrame}.
+        """
+        db_manager = get_db_manager()
+        collection = db_manager.get_collection("linkedin_profiles")
+        available = collection.count()
+        shortlists = {job_description: None for job_description in job_descriptions}
+        if available == 0 or not shortlists:
+            return shortlists
+        
+        job_descriptions = list(shortlists)
+        embeddings = dict(zip(job_descriptions, get_embedding_function()(job_descriptions)))
+        
+        groups = {}
+        for job_description in job_descriptions:
+            job_filters = filters if filters is not None else resolve_filters(job_description)
+            where = build_where(**job_filters) if job_filters else None
+            groups.setdefault(repr(where), (where, []))[1].append(job_description)
+        
+        for where, group in groups.values():
+            results = db_manager.query(
+                "linkedin_profiles",
+                query_embeddings=[embeddings[job_description] for job_description in group],
+                n_results=min(pool_size, available),
+                where=where,
+                include=["metadatas", "distances"]
+            )
+            for i, job_description in enumerate(group):
+                if not results['ids'][i]:
+                    continue
+                ranked = score_candidates(
+                    job_description,
+                    results['ids'][i],
+                    results['metadatas'][i],
+                    distances=results['distances'][i],
+                    similarity_weight=similarity_weight
+                )
+                shortlists[job_description] = ranked.head(shortlist_size)
+        
+        return shortlists
+
+    @staticmethod
+    def batch_screen_report(job_descriptions, shortlist_size=5, **kwargs):
+        """Text report of `batch_screen_requisitions` for the CLI and the agent"""
+        try:
+            start = time.perf_counter()
+            shortlists = CVScreeningAgent.batch_screen_requisitions(
+                job_descriptions, shortlist_size=shortlist_size, **kwargs)
+            elapsed = time.perf_counter() - start
+            
+            output = " BATCH REQUISITION MATCHING \n\n"
+            output += f"Matched {len(shortlists)} requisitions in {elapsed:.2f}s\n\n"
+            for job_description, shortlist in shortlists.items():
+                output += f"=== {job_description} ===\n"
+                if shortlist is None or shortlist.empty:
+                    output += "No matching profiles found in the database.\n\n"
+                else:
+                    output += CVScreeningAgent.format_shortlist(shortlist)
+            return output
+        except Exception as e:
+            return f"Error screening requisitions: {str(e)}"
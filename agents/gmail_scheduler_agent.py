@@ -1,50 +1,27 @@
 from crewai import Agent
-from langchain_mistralai.chat_models import ChatMistralAI
+from utils.llm import get_llm
 from crewai.tools import BaseTool
 import os
-import smtplib
-from email.mime.text import MIMEText
+import time
 from typing import List, Any
+from utils.email_dispatch import EmailDispatcher, build_message
 
-smtp_server = "smtp.gmail.com"
-smtp_port = 587
 sender_email = os.getenv("GMAIL_SENDER")
-sender_password = os.getenv("GMAIL_PASSWORD")
 
-server = smtplib.SMTP(smtp_server, smtp_port)
-server.starttls()
-server.login(sender_email, sender_password)
+_dispatcher = None
+
+def get_dispatcher():
+    """Shared dispatcher; connections are opened on the first send, not at import time"""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = EmailDispatcher()
+    return _dispatcher
 
 def generate_google_meet_link():
     return "https://meet.google.com/dummy-meet-link"
 
-def send_email(recipient, subject, body):
-    msg = MIMEText(body)
-    msg['Subject'] = subject
-    msg['From'] = sender_email
-    msg['To'] = recipient
-
-    try:
-        server.send_message(msg)
-        print(f"Email sent to {recipient}")
-        return True
-    except Exception as e:
-        print(f"Failed to send email: {str(e)}")
-        return False
-
-class EmailSendingTool(BaseTool):
-    name: str = "email_scheduler"
-    description: str = "Schedules interviews by sending emails with Google Meet links"
-    
-    def _run(self, emails_str: str) -> str:
-        emails = [e.strip() for e in emails_str.split(',')]
-        results = []
-        
-        for email in emails:
-            try:
-                meet_link = generate_google_meet_link()
-                subject = "Interview Invitation"
-                body = f"""
+def invitation_body(meet_link):
+    return f"""
                 Dear Candidate,
 
                 You have been selected for an interview. 
@@ -53,23 +30,49 @@ class EmailSendingTool(BaseTool):
                 Best regards,
                 HR Team
                 """
-                success = send_email(email, subject, body)
-                if success:
-                    results.append(f"Email sent to {email} with meet link: {meet_link}")
-                else:
-                    results.append(f"Failed to send email to {email}")
-            except Exception as e:
-                results.append(f"Error sending to {email}: {str(e)}")
-        
-        return "\n".join(results)
+
+def send_email(recipient, subject, body):
+    ok, error = get_dispatcher().send(build_message(sender_email, recipient, subject, body))
+    if ok:
+        print(f"Email sent to {recipient}")
+    else:
+        print(f"Failed to send email: {error}")
+    return ok
+
+def send_invitations(emails):
+    """Send interview invitations to every address concurrently; returns one result line per address"""
+    messages, links = [], {}
+    for email in emails:
+        links[email] = generate_google_meet_link()
+        messages.append(build_message(sender_email, email, "Interview Invitation", invitation_body(links[email])))
+
+    start = time.perf_counter()
+    outcomes = get_dispatcher().send_many(messages)
+    print(f"Dispatched {len(messages)} invitations in {time.perf_counter() - start:.2f}s")
+
+    results = []
+    for email, ok, error in outcomes:
+        if ok:
+            results.append(f"Email sent to {email} with meet link: {links[email]}")
+        else:
+            results.append(f"Failed to send email to {email}: {error}")
+    return results
+
+class EmailSendingTool(BaseTool):
+    name: str = "email_scheduler"
+    description: str = "Schedules interviews by sending emails with Google Meet links"
+    
+    def _run(self, emails_str: str) -> str:
+        emails = [e.strip() for e in emails_str.split(',') if e.strip()]
+        try:
+            return "\n".join(send_invitations(emails))
+        except Exception as e:
+            return f"Error sending invitations: {str(e)}"
 
 class GmailSchedulerAgent:
     @staticmethod
     def agent():
-        llm = ChatMistralAI(
-            api_key=os.getenv("MISTRAL_API_KEY"),
-            model="mistral/mistral-large-latest"
-        )
+        llm = get_llm()
         
         email_tool = EmailSendingTool()
         
@@ -85,15 +88,5 @@ class GmailSchedulerAgent:
     @staticmethod
     def schedule_interview(candidate_email):
         meet_link = generate_google_meet_link()
-        subject = "Interview Invitation"
-        body = f"""
-        Dear Candidate,
-
-        You have been selected for an interview. 
-        Please join us using this Google Meet link: {meet_link}
-
-        Best regards,
-        HR Team
-        """
-        send_email(candidate_email, subject, body)
+        send_email(candidate_email, "Interview Invitation", invitation_body(meet_link))
         return meet_link
@@ -1,19 +1,38 @@
 from crewai import Agent
-from langchain_mistralai.chat_models import ChatMistralAI
+from utils.llm import get_llm
 import os
 from tenacity import retry, stop_after_attempt, wait_exponential
+from utils.interpretation_cache import InterpretationCache
+from utils.embedding_cache import get_embedding_function
+from utils.query_filters import parse_constraints
 
 class HRQueryAgent:
+    interpretation_cache = None
+    # Part of the agent cache key (tasks.hr_tasks.AgentRegistry), so changing it builds a fresh agent
+    llm_config = {"temperature": 0.3, "max_retries": 5, "retry_min_seconds": 4, "retry_max_seconds": 60}
+
+    @staticmethod
+    def get_interpretation_cache():
+        if HRQueryAgent.interpretation_cache is None:
+            # Near-duplicate lookup costs an embedding call per miss, so it is opt-in
+            semantic = os.getenv("PROACQUIS_INTERPRETATION_SEMANTIC", "0") == "1"
+            HRQueryAgent.interpretation_cache = InterpretationCache(
+                embed=get_embedding_function() if semantic else None,
+                constraints=parse_constraints
+            )
+        return HRQueryAgent.interpretation_cache
+
+    @staticmethod
+    def cached_interpretation(hr_query):
+        return HRQueryAgent.get_interpretation_cache().get(hr_query)
+
+    @staticmethod
+    def store_interpretation(hr_query, interpretation):
+        HRQueryAgent.get_interpretation_cache().put(hr_query, interpretation)
+
     @staticmethod
     def agent():
-        llm = ChatMistralAI(
-            api_key=os.getenv("MISTRAL_API_KEY"),
-            model="mistral/mistral-large-latest",
-            temperature=0.3,
-            max_retries=5,
-            retry_min_seconds=4,
-            retry_max_seconds=60
-        )
+        llm = get_llm(**HRQueryAgent.llm_config)
         return Agent(
             role="HR Query Handler",
             goal="Interpret HR's job role queries to instruct other agents.",
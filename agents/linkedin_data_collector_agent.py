@@ -1,12 +1,72 @@
 import os
 import json
-import http.client
+import time
+import threading
+from urllib.parse import quote, urlsplit
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, ALL_COMPLETED
 from crewai import Agent
-from langchain_mistralai.chat_models import ChatMistralAI
+from utils.llm import get_llm
 from crewai.tools import BaseTool
-from utils.db import DBManager
+from utils.db import get_db_manager
+from utils.http_client import KeepAliveClient, TokenBucket
+from utils.http_cache import get_response_cache
+from utils.ingestion import build_linkedin_record, LINKEDIN_SOURCE
+from utils.raw_store import RawPayloadStore
+from utils.linkedin_profile import is_profile_payload
 from typing import List, Any
 
+RAPIDAPI_BASE_URL = os.getenv("RAPIDAPI_BASE_URL", "https://linkedin-data-api.p.rapidapi.com")
+# Requests per second allowed by the RapidAPI plan, and how many may be in flight at once
+RAPIDAPI_RATE = float(os.getenv("PROACQUIS_RAPIDAPI_RATE", "5"))
+COLLECTOR_WORKERS = int(os.getenv("PROACQUIS_LINKEDIN_WORKERS", "8"))
+STORE_BATCH_SIZE = int(os.getenv("PROACQUIS_LINKEDIN_STORE_BATCH", "50"))
+# Profiles change slowly, so a fetched profile is reused for a week before spending quota again
+RAPIDAPI_CACHE_TTL = float(os.getenv("PROACQUIS_RAPIDAPI_CACHE_TTL", str(7 * 24 * 3600)))
+# Raw API payloads are only needed for re-parsing later, so they live in a compressed side store
+KEEP_RAW_PAYLOADS = os.getenv("PROACQUIS_KEEP_RAW_PAYLOADS", "1") == "1"
+
+_raw_store = None
+# Collector workers call these on their first request, so creation is guarded: a second
+# client for the same key would bring its own full TokenBucket and burst past RAPIDAPI_RATE
+_client_lock = threading.Lock()
+
+def get_raw_store():
+    global _raw_store
+    if _raw_store is None:
+        with _client_lock:
+            if _raw_store is None:
+                _raw_store = RawPayloadStore()
+    return _raw_store
+
+_rapidapi_clients = {}
+
+def _is_profile_response(response):
+    try:
+        return is_profile_payload(response.json())
+    except ValueError:
+        return False
+
+def get_rapidapi_client(rapidapi_key):
+    """One keep-alive client and rate limiter per API key, shared by every collection run"""
+    client = _rapidapi_clients.get(rapidapi_key)
+    if client is None:
+        with _client_lock:
+            client = _rapidapi_clients.get(rapidapi_key)
+            if client is None:
+                client = KeepAliveClient(
+                    RAPIDAPI_BASE_URL,
+                    headers={
+                        'x-rapidapi-key': rapidapi_key,
+                        'x-rapidapi-host': urlsplit(RAPIDAPI_BASE_URL).hostname
+                    },
+                    rate_limiter=TokenBucket(RAPIDAPI_RATE),
+                    cache=get_response_cache(),
+                    cache_ttl=RAPIDAPI_CACHE_TTL,
+                    cache_validator=_is_profile_response
+                )
+                _rapidapi_clients[rapidapi_key] = client
+    return client
+
 class LinkedInProfileCollectorTool(BaseTool):
     name: str = "linkedin_profile_collector"
     description: str = "Collects LinkedIn profile data using RapidAPI"
@@ -20,20 +80,18 @@ def fetch_linkedin_profile(username, rapidapi_key):
     """Fetch a LinkedIn profile using RapidAPI"""
     print(f"Attempting to fetch LinkedIn data for: {username}")
     
-    conn = http.client.HTTPSConnection("linkedin-data-api.p.rapidapi.com")
-    
-    headers = {
-        'x-rapidapi-key': rapidapi_key,
-        'x-rapidapi-host': "linkedin-data-api.p.rapidapi.com"
-    }
-    
     try:
-        conn.request("GET", f"/?username={username}", headers=headers)
-        
-        res = conn.getresponse()
-        data = res.read().decode("utf-8")
+        res = get_rapidapi_client(rapidapi_key).request("GET", f"/?username={quote(username)}")
+        data = res.text
         
-        if res.status == 200:
+        if res.status == 200 and not _is_profile_response(res):
+            print(f"API ERROR (200 without a profile): {data[:200]}")
+            return {
+                "status": "error",
+                "username": username,
+                "message": f"API returned no profile: {data[:100]}..."
+            }
+        elif res.status == 200:
             json_data = json.loads(data)
             print(f"SUCCESS: Retrieved LinkedIn profile for {username}")
             return {
@@ -58,35 +116,84 @@ def fetch_linkedin_profile(username, rapidapi_key):
 
 def store_profile_in_chromadb(profile_data):
     """Store profile data in ChromaDB only"""
+    return store_profiles_in_chromadb([profile_data]) == 1
+
+def store_profiles_in_chromadb(profiles):
+    """Store every successfully fetched profile in one ChromaDB write; returns how many were stored"""
+    stored = [profile for profile in profiles if profile["status"] == "success"]
+    for profile in profiles:
+        if profile["status"] != "success":
+            print(f"Skipping ChromaDB storage for {profile['username']} due to error status")
+    if not stored:
+        return 0
+
     try:
-        db_manager = DBManager(path='data/chromadb_data')
+        records = [build_linkedin_record(profile["username"], profile["data"]) for profile in stored]
+        db_manager = get_db_manager()
+        db_manager.migrate_embeddings("linkedin_profiles")
         collection = db_manager.get_collection("linkedin_profiles")
-        
-        if profile_data["status"] == "success":
-            profile_text = json.dumps(profile_data["data"])
-            username = profile_data["username"]
-
-            collection.add(
-                documents=[profile_text],
-                ids=[username],
-                metadatas=[{"name": username, "source": "linkedin"}]
-            )
-            print(f"Successfully stored {username} profile in ChromaDB")
-            return True
-        else:
-            print(f"Skipping ChromaDB storage for {profile_data['username']} due to error status")
-            return False
+        collection.upsert(
+            ids=[record[0] for record in records],
+            documents=[record[1] for record in records],
+            metadatas=[record[2] for record in records]
+        )
+        db_manager.lexical_index("linkedin_profiles").upsert([record[0] for record in records],
+                                                             [record[1] for record in records])
+        db_manager.bump_version("linkedin_profiles")
+        if KEEP_RAW_PAYLOADS:
+            get_raw_store().put_many(LINKEDIN_SOURCE, {profile["username"]: profile["data"] for profile in stored})
+        for profile in stored:
+            profile["stored"] = True
+        print(f"Successfully stored {len(stored)} profiles in ChromaDB")
+        return len(stored)
     except Exception as e:
         print(f"ChromaDB Storage Error: {str(e)}")
-        return False
+        return 0
+
+def default_rapidapi_key():
+    return os.getenv("RAPIDAPI_KEY", "9d945b1d2dmsh17ccfdbee0961bcp11f9dejsn618ca87f16d6")
+
+def collect_profiles(usernames, rapidapi_key=None, batch_size=STORE_BATCH_SIZE, workers=COLLECTOR_WORKERS):
+    """Fetch and store profiles for usernames from any iterable, including a generator still producing them.
+
+    Fetching starts as soon as each username arrives, with at most
+    `workers` requests in flight, and fetched profiles are written to
+    ChromaDB every `batch_size`. Returns the fetch results in completion order.
+    """
+    rapidapi_key = rapidapi_key or default_rapidapi_key()
+    collected, batch, seen = [], [], set()
+
+    def drain(futures, return_when):
+        nonlocal batch
+        done, pending = wait(futures, return_when=return_when)
+        for future in done:
+            collected.append(future.result())
+            batch.append(collected[-1])
+        if len(batch) >= batch_size:
+            store_profiles_in_chromadb(batch)
+            batch = []
+        return pending
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        in_flight = set()
+        for username in usernames:
+            if not username or username in seen:
+                continue
+            seen.add(username)
+            in_flight.add(executor.submit(fetch_linkedin_profile, username, rapidapi_key))
+            if len(in_flight) >= workers:
+                in_flight = drain(in_flight, FIRST_COMPLETED)
+        if in_flight:
+            drain(in_flight, ALL_COMPLETED)
+
+    if batch:
+        store_profiles_in_chromadb(batch)
+    return collected
 
 class LinkedInDataCollectorAgent:
     @staticmethod
     def agent():
-        llm = ChatMistralAI(
-            api_key=os.getenv("MISTRAL_API_KEY"),
-            model="mistral/mistral-large-latest"
-        )
+        llm = get_llm()
         
         collector_tool = LinkedInProfileCollectorTool()
         
@@ -101,38 +208,29 @@ class LinkedInDataCollectorAgent:
 
     @staticmethod
     def update_profiles(usernames):
-        rapidapi_key = os.getenv("RAPIDAPI_KEY", "9d945b1d2dmsh17ccfdbee0961bcp11f9dejsn618ca87f16d6")
-        collected_profiles = []
-        success_count = 0
-        error_count = 0
-        
         print("\n===== LINKEDIN PROFILE COLLECTION PROCESS =====")
-        print(f"Attempting to collect data for {len(usernames)} profiles...")
+        print("Collecting LinkedIn profiles...")
         
-        for username in usernames:
-            profile_data = fetch_linkedin_profile(username, rapidapi_key)
-            collected_profiles.append(profile_data)
-            
-            if profile_data["status"] == "success":
-                stored = store_profile_in_chromadb(profile_data)
-                if stored:
-                    success_count += 1
-                else:
-                    error_count += 1
-            else:
-                error_count += 1
+        start = time.perf_counter()
+        collected_profiles = collect_profiles(usernames)
+        
+        success_count = sum(1 for profile in collected_profiles if profile.get("stored"))
+        error_count = len(collected_profiles) - success_count
+        print(f"Collected {len(collected_profiles)} profiles in {time.perf_counter() - start:.2f}s")
         
         result = f"""
  LINKEDIN DATA COLLECTION SUMMARY
-Total profiles attempted: {len(usernames)}
+Total profiles attempted: {len(collected_profiles)}
 Successfully retrieved and stored: {success_count}
 Failed: {error_count}
 
 Detail by profile:
 """
         for profile in collected_profiles:
-            if profile["status"] == "success":
+            if profile.get("stored"):
                 result += f"{profile['username']}: Successfully retrieved and stored in ChromaDB\n"
+            elif profile["status"] == "success":
+                result += f"{profile['username']}: Retrieved but could not be stored in ChromaDB\n"
             else:
                 result += f"{profile['username']}: {profile['message']}\n"
                 
@@ -1,24 +1,71 @@
-import http.client
-import json
 import os
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from crewai import Agent
-from langchain_mistralai.chat_models import ChatMistralAI
+from crewai.tools import BaseTool
+from utils.llm import get_llm
+from utils.http_client import KeepAliveClient, TokenBucket
+from utils.http_cache import get_response_cache
+from utils.resume_parser import find_locations, KNOWN_LOCATIONS
 
+SERPER_BASE_URL = os.getenv("SERPER_BASE_URL", "https://google.serper.dev")
+# Search results for a role barely move within a day
+SERPER_CACHE_TTL = float(os.getenv("PROACQUIS_SERPER_CACHE_TTL", str(24 * 3600)))
+SERPER_RATE = float(os.getenv("PROACQUIS_SERPER_RATE", "5"))
+SEARCH_WORKERS = int(os.getenv("PROACQUIS_SEARCH_WORKERS", "4"))
+RESULTS_PER_PAGE = 10
+DEFAULT_PAGES = int(os.getenv("PROACQUIS_SEARCH_PAGES", "3"))
+DEFAULT_SENIORITIES = ["", "Senior", "Lead"]
 
-def search_linkedin_profiles(query, api_key):
-    conn = http.client.HTTPSConnection("google.serper.dev")
-    payload = json.dumps({
+_SENIORITY_PATTERN = re.compile(r"\b(senior|sr\.?|junior|jr\.?|lead|principal|staff|head|chief)\b", re.IGNORECASE)
+_LOCATION_PHRASE_PATTERN = re.compile(
+    r"(?:\b(?:in|at|from|near|or|and)\s+|,\s*)*\b(?:" +
+    "|".join(re.escape(location) for location in sorted(KNOWN_LOCATIONS, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE
+)
+
+_serper_clients = {}
+# Search workers race to create the first client; two would each get a full TokenBucket
+_serper_clients_lock = threading.Lock()
+
+def _is_search_response(response):
+    """Serper reports quota and key errors as 200 {"message": ...}; real results carry an organic list"""
+    try:
+        return "organic" in response.json()
+    except (ValueError, TypeError):
+        return False
+
+
+def get_serper_client(api_key):
+    client = _serper_clients.get(api_key)
+    if client is None:
+        with _serper_clients_lock:
+            client = _serper_clients.get(api_key)
+            if client is None:
+                client = KeepAliveClient(
+                    SERPER_BASE_URL,
+                    headers={'X-API-KEY': api_key, 'Content-Type': 'application/json'},
+                    rate_limiter=TokenBucket(SERPER_RATE),
+                    cache=get_response_cache(),
+                    cache_ttl=SERPER_CACHE_TTL,
+                    cache_validator=_is_search_response
+                )
+                _serper_clients[api_key] = client
+    return client
+
+
+def search_linkedin_profiles(query, api_key, num=5, page=1):
+    payload = {
       "q": f"{query} site:linkedin.com/in",
-      "num": 5  # You can increase this if needed
-    })
-    headers = {
-        'X-API-KEY': api_key,
-        'Content-Type': 'application/json'
+      "num": num,
+      "page": page
     }
-    conn.request("POST", "/search", payload, headers)
-    res = conn.getresponse()
-    data = res.read()
-    results = json.loads(data.decode("utf-8"))
+    res = get_serper_client(api_key).request("POST", "/search", payload)
+    if res.status != 200 or not _is_search_response(res):
+        raise RuntimeError(f"Serper returned status {res.status}: {res.text[:100]}")
+    results = res.json()
 
     linkedin_profiles = []
 
@@ -26,7 +73,7 @@ def search_linkedin_profiles(query, api_key):
         link = result.get("link", "")
         title = result.get("title", "")
         if "linkedin.com/in/" in link:
-            username = link.split("/in/")[1].split("/")[0]
+            username = link.split("/in/")[1].split("/")[0].split("?")[0]
             linkedin_profiles.append({
                 "name": title,
                 "profile_url": link,
@@ -35,23 +82,107 @@ def search_linkedin_profiles(query, api_key):
 
     return linkedin_profiles
 
+
+def query_variants(role, locations=None, seniorities=None):
+    """role x location x seniority search strings; locations default to those mentioned in `role`"""
+    if locations is None:
+        locations = [location for location in find_locations(role) if location != "Remote"]
+        role = " ".join(_LOCATION_PHRASE_PATTERN.sub(" ", role).split()).strip(" ,")
+    if seniorities is None:
+        # A role that already names its level is searched as given
+        seniorities = [""] if _SENIORITY_PATTERN.search(role) else DEFAULT_SENIORITIES
+
+    variants = []
+    for seniority in seniorities:
+        base = f"{seniority} {role}".strip()
+        for location in locations or [""]:
+            query = f"{base} {location}".strip()
+            if query not in variants:
+                variants.append(query)
+    return variants
+
+
+def iter_linkedin_search(queries, api_key, pages=DEFAULT_PAGES, workers=SEARCH_WORKERS, max_profiles=None):
+    """Yield unique LinkedIn profiles across every query and page as results come in.
+
+    Page 1 of each query is requested first; a query's next page is only
+    requested when the previous one came back full. At most `workers`
+    requests are in flight.
+    """
+    seen = set()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        def submit(query, page):
+            return executor.submit(search_linkedin_profiles, query, api_key, RESULTS_PER_PAGE, page)
+
+        in_flight = {submit(query, 1): (query, 1) for query in queries}
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                query, page = in_flight.pop(future)
+                try:
+                    profiles = future.result()
+                except Exception as e:
+                    print(f"Search failed for '{query}' page {page}: {str(e)}")
+                    continue
+
+                if len(profiles) >= RESULTS_PER_PAGE and page < pages:
+                    in_flight[submit(query, page + 1)] = (query, page + 1)
+
+                for profile in profiles:
+                    if profile["username"] in seen:
+                        continue
+                    seen.add(profile["username"])
+                    yield profile
+                    if max_profiles and len(seen) >= max_profiles:
+                        for pending in in_flight:
+                            pending.cancel()
+                        return
+
+
+def source_candidates(role, locations=None, max_profiles=200, pages=DEFAULT_PAGES, serper_api_key=None,
+                      rapidapi_key=None):
+    """Search every query variant for `role` and feed usernames into the profile collector as they are found"""
+    from agents.linkedin_data_collector_agent import collect_profiles
+
+    serper_api_key = serper_api_key or os.getenv("SERPER_API_KEY")
+    queries = query_variants(role, locations)
+    start = time.perf_counter()
+
+    usernames = (profile["username"] for profile in
+                 iter_linkedin_search(queries, serper_api_key, pages=pages, max_profiles=max_profiles))
+    collected = collect_profiles(usernames, rapidapi_key)
+
+    stored = sum(1 for profile in collected if profile.get("stored"))
+    print(f"Sourced {len(collected)} candidates from {len(queries)} queries in {time.perf_counter() - start:.2f}s")
+    return {"queries": queries, "found": len(collected), "stored": stored,
+            "usernames": [profile["username"] for profile in collected]}
+
+
+class LinkedInSearchTool(BaseTool):
+    name: str = "linkedin_search"
+    description: str = ("Searches Google for LinkedIn profiles matching a job role across several pages and "
+                        "seniority/location variants, then collects and stores the profiles found")
+
+    def _run(self, role: str, locations: str = "", max_profiles: int = 100) -> str:
+        try:
+            location_list = [location.strip() for location in locations.split(",") if location.strip()] or None
+            result = source_candidates(role, location_list, max_profiles=max_profiles)
+            return (f"Searched {len(result['queries'])} queries, found {result['found']} LinkedIn profiles, "
+                    f"stored {result['stored']}.\nUsernames: {', '.join(result['usernames'])}")
+        except Exception as e:
+            return f"Error searching LinkedIn: {str(e)}"
+
+
 class LinkedInSearchAgent:
     @staticmethod
     def agent():
-        llm = ChatMistralAI(
-            api_key=os.getenv("MISTRAL_API_KEY"),
-            model="mistral/mistral-large-latest"
-        )
+        llm = get_llm()
+        search_tool = LinkedInSearchTool()
         return Agent(
             role="LinkedIn Search Agent",
             goal="Search Google for LinkedIn profiles using SerperAPI.",
             backstory="Efficiently extract LinkedIn usernames by querying Google with a given job search string.",
             llm=llm,
             allow_delegation=False,
+            tools=[search_tool]
         )
-
-
-
-
-
-
@@ -1,26 +1,33 @@
 import os
 from crewai import Agent
-from langchain_mistralai.chat_models import ChatMistralAI
-from utils.db import DBManager
+from utils.llm import get_llm
+from utils.db import get_db_manager
+from utils.query_filters import build_where, resolve_filters, describe_filters
+from utils.result_cache import get_result_cache, result_key
 from crewai.tools import BaseTool
 from typing import Optional, Dict, Any
 
+# Fuse BM25 keyword ranking with vector similarity so exact skills/certifications are not outranked
+HYBRID_SEARCH = os.getenv("PROACQUIS_HYBRID_SEARCH", "1") == "1"
+
 class ProfileSearchTool(BaseTool):
     name: str = "profile_search_tool"
-    description: str = "Searches for candidate profiles using similarity search based on a job query"
+    description: str = ("Searches for candidate profiles using similarity search based on a job query. "
+                        "Optional location, role, min_years, max_years and source narrow the search; "
+                        "when none are given they are read from the query (e.g. 'Delhi, 5+ years').")
     
-    def _run(self, query: str, top_k: int = 5) -> str:
+    def _run(self, query: str, top_k: int = 5, location: Optional[str] = None, role: Optional[str] = None,
+             min_years: Optional[float] = None, max_years: Optional[float] = None,
+             source: Optional[str] = None) -> str:
         """Search for profiles matching the query"""
-        results = ProfileFinderAgent.search_profiles(query, top_k)
+        filters = resolve_filters(query, location, role, min_years, max_years, source)
+        results = ProfileFinderAgent.search_profiles(query, top_k, filters=filters)
         return results
 
 class ProfileFinderAgent:
     @staticmethod
     def agent():
-        llm = ChatMistralAI(
-            api_key=os.getenv("MISTRAL_API_KEY"),
-            model="mistral/mistral-large-latest"
-        )
+        llm = get_llm()
         
         profile_tool = ProfileSearchTool()
         
@@ -35,20 +42,31 @@ class ProfileFinderAgent:
         )
 
     @staticmethod
-    def search_profiles(query, top_k=5):
+    def search_profiles(query, top_k=5, filters=None):
+        """Formatted top_k matches, served from the result cache until the collection changes"""
+        db_manager = get_db_manager()
+        key = result_key("profile_search", query, filters, top_k, db_manager.collection_version("linkedin_profiles"))
+        return get_result_cache().get_or_compute(
+            key,
+            lambda: ProfileFinderAgent._search_profiles(db_manager, query, top_k, filters),
+            cacheable=lambda result: not result.startswith("Error")
+        )
+
+    @staticmethod
+    def _search_profiles(db_manager, query, top_k, filters):
         try:
-            db_manager = DBManager(path='data/chromadb_data')
-            collection = db_manager.get_collection("linkedin_profiles")
-            
-            results = collection.query(
-                query_texts=[query],
-                n_results=top_k
-            )
+            where = build_where(**filters) if filters else None
+            if HYBRID_SEARCH:
+                results = db_manager.hybrid_query("linkedin_profiles", query, n_results=top_k, where=where)
+            else:
+                results = db_manager.query("linkedin_profiles", query_texts=[query], n_results=top_k, where=where)
             
-            if not results or not results['ids']:
-                return "No matching profiles found."
+            if not results or not results['ids'] or len(results['ids'][0]) == 0:
+                return f"No matching profiles found (filters: {describe_filters(filters)})."
             
             formatted_results = []
+            if filters:
+                formatted_results.append(f"Filters applied: {describe_filters(filters)}\n")
             
             for i in range(len(results['ids'][0])):
                 doc_text = results['documents'][0][i] if i < len(results['documents'][0]) else "No document text available"
@@ -67,7 +85,14 @@ class ProfileFinderAgent:
                 
                 profile_info += f"\nProfile Details:\n{doc_text}\n"
                 
-                if 'distances' in results and len(results['distances']) > 0:
+                if 'scores' in results:
+                    keyword_rank = results['keyword_ranks'][0][i]
+                    distance = results['distances'][0][i]
+                    # Keyword-only hits were not among the vector candidates, so they have no distance
+                    vector_part = f"vector distance: {distance}" if distance is not None else "keyword match only"
+                    profile_info += (f"\nRelevance Score: {results['scores'][0][i]:.4f} "
+                                     f"({vector_part}, keyword rank: {keyword_rank or 'N/A'})\n")
+                elif 'distances' in results and len(results['distances']) > 0:
                     score = results['distances'][0][i] if i < len(results['distances'][0]) else "N/A"
                     profile_info += f"\nRelevance Score: {score}\n"
                 
@@ -1,7 +1,8 @@
-import os
 from crewai import Agent
-from langchain_mistralai.chat_models import ChatMistralAI
-from utils.db import DBManager
+from utils.llm import get_llm
+from utils.db import get_db_manager
+from utils.query_filters import build_where, parse_constraints
+from utils.result_cache import get_result_cache, result_key
 from crewai.tools import BaseTool
 from typing import Optional, Dict, Any
 
@@ -29,10 +30,7 @@ class QueryResponseAgent:
         if recruitment_data:
             QueryResponseAgent.recruitment_data = recruitment_data
             
-        llm = ChatMistralAI(
-            api_key=os.getenv("MISTRAL_API_KEY"),
-            model="mistral/mistral-large-latest"
-        )
+        llm = get_llm()
         
         query_tool = QueryDatabaseTool()
         report_tool = RetrieveReportTool()
@@ -50,7 +48,7 @@ class QueryResponseAgent:
         )
 
     @staticmethod
-    def answer_query(query):
+    def answer_query(query, filters=None):
         try:
             if QueryResponseAgent.recruitment_data:
                 
@@ -66,39 +64,51 @@ class QueryResponseAgent:
                 if "schedule" in query.lower() and "scheduling" in QueryResponseAgent.recruitment_data:
                     return f"Interview scheduling information:\n{QueryResponseAgent.recruitment_data.get('scheduling')}"
             
-            db_manager = DBManager(path='data/chromadb_data')
-            collection = db_manager.get_collection("linkedin_profiles")
+            db_manager = get_db_manager()
             
-            results = collection.query(
-                query_texts=[query],
-                n_results=3
-            )
+            if filters is None:
+                filters = parse_constraints(query)
             
-            if not results or not results['ids'] or len(results['ids'][0]) == 0:
-                return "I don't have specific information to answer this query. Please try a different question or provide more context."
+            key = result_key("query_response", query, filters, 3, db_manager.collection_version("linkedin_profiles"))
+            return get_result_cache().get_or_compute(
+                key,
+                lambda: QueryResponseAgent._answer_from_database(db_manager, query, filters)
+            )
             
-            response = f"Based on the available information, here's what I found for '{query}':\n\n"
+        except Exception as e:
+            return f"Error answering query: {str(e)}. Please try a more specific question or check the database connection."
+
+    @staticmethod
+    def _answer_from_database(db_manager, query, filters):
+        results = db_manager.query(
+            "linkedin_profiles",
+            query_texts=[query],
+            n_results=3,
+            where=build_where(**filters) if filters else None
+        )
+        
+        if not results or not results['ids'] or len(results['ids'][0]) == 0:
+            return "I don't have specific information to answer this query. Please try a different question or provide more context."
+        
+        response = f"Based on the available information, here's what I found for '{query}':\n\n"
+        
+        for i in range(len(results['ids'][0])):
+            metadata = results['metadatas'][0][i] if i < len(results['metadatas'][0]) else {}
             
-            for i in range(len(results['ids'][0])):
-                metadata = results['metadatas'][0][i] if i < len(results['metadatas'][0]) else {}
-                
-                response += f"--- Candidate {i+1} ---\n"
-                if metadata:
-                    response += f"Name: {metadata.get('name', 'N/A')}\n"
-                    response += f"Role: {metadata.get('role', 'N/A')}\n"
-                    response += f"Skills: {metadata.get('skills', 'N/A')}\n"
-                    response += f"Experience: {metadata.get('years_experience', 'N/A')}\n"
-                
-                if i < len(results['documents'][0]):
-                    doc_text = results['documents'][0][i][:100] + "..." if len(results['documents'][0][i]) > 100 else results['documents'][0][i]
-                    response += f"Profile Summary: {doc_text}\n"
-                
-                response += "\n"
+            response += f"--- Candidate {i+1} ---\n"
+            if metadata:
+                response += f"Name: {metadata.get('name', 'N/A')}\n"
+                response += f"Role: {metadata.get('role', 'N/A')}\n"
+                response += f"Skills: {metadata.get('skills', 'N/A')}\n"
+                response += f"Experience: {metadata.get('years_experience', 'N/A')}\n"
             
-            return response
+            if i < len(results['documents'][0]):
+                doc_text = results['documents'][0][i][:100] + "..." if len(results['documents'][0][i]) > 100 else results['documents'][0][i]
+                response += f"Profile Summary: {doc_text}\n"
             
-        except Exception as e:
-            return f"Error answering query: {str(e)}. Please try a more specific question or check the database connection."
+            response += "\n"
+        
+        return response
 
     @staticmethod
     def get_report_data(report_type="full"):
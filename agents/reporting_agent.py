@@ -1,8 +1,7 @@
 from crewai import Agent
-from langchain_mistralai.chat_models import ChatMistralAI
-from utils.db import DBManager
+from utils.llm import get_llm
+from utils.db import get_db_manager
 from crewai.tools import BaseTool
-import os
 
 class ReportingTool(BaseTool):
     name: str = "reporting_tool"
@@ -20,10 +19,7 @@ class ReportingAgent:
     
     @staticmethod
     def agent():
-        llm = ChatMistralAI(
-            api_key=os.getenv("MISTRAL_API_KEY"),
-            model="mistral/mistral-large-latest"  # Updated to use mistralai provider prefix
-        )
+        llm = get_llm()
         
         report_tool = ReportingTool()
         
@@ -39,10 +35,10 @@ class ReportingAgent:
     @staticmethod
     def generate_report():
         try:
-            db_manager = DBManager(path='data/chromadb_data')
-            collection = db_manager.get_collection("linkedin_profiles")
+            db_manager = get_db_manager()
             
-            results = collection.query(
+            results = db_manager.query(
+                "linkedin_profiles",
                 query_texts=["experienced software engineer"],
                 n_results=3
             )
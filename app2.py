@@ -1,22 +1,20 @@
-import PyPDF2
-import plotly.express as px
 import streamlit as st
 import pandas as pd
 import time
-import os
-import random
 import io
+import json
+import hashlib
+import uuid
 from dotenv import load_dotenv
-from tasks.hr_tasks import HRTasks
-from crewai import Crew, Process
-from utils.db import DBManager
-from langchain_mistralai import MistralAIEmbeddings
-from agents.reporting_agent import ReportingAgent
+from tasks.hr_tasks import HRTasks, AgentRegistry
+from utils.jobs import get_job_runner, DONE, FINISHED_STATES
 import tenacity
 from tenacity import retry, stop_after_attempt, wait_exponential
-from fpdf import FPDF
 import base64
 
+# crewai, chromadb, plotly, fpdf and the agents are imported inside the functions that use them,
+# so a cold start only pays for Streamlit and pandas (see `python -m utils.startup app2`)
+
 load_dotenv()
 
 st.set_page_config(
@@ -148,61 +146,107 @@ if 'report_generated' not in st.session_state:
 if 'final_report' not in st.session_state:
     st.session_state.final_report = ""
 
-@retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=4, max=10))
-def load_synthetic_profiles():
-    with st.spinner("Loading synthetic profiles from CSV into ChromaDB..."):
-        try:
-            profiles_df = pd.read_excel("data/cs_engineers.xlsx")
-            
-            db_manager = DBManager(path='data/chromadb_data')
-            try:
-                db_manager.client.delete_collection("linkedin_profiles")
-            except:
-                st.write("No existing collection to delete")
-            
-            collection = db_manager.get_collection("linkedin_profiles")
-            
-            embedding_fn = MistralAIEmbeddings(model="mistral-embed", api_key=os.getenv('MISTRAL_API_KEY'))
-            
-            processed = 0
-            for _, row in profiles_df.iterrows():
-                try:
-                    profile_text = f"""
-                    Name: {row.get('Name', 'N/A')}
-                    Role: {row.get('Role', 'N/A')}
-                    Location: {row.get('Location', 'N/A')}
-                    Skills: {row.get('Skills', 'N/A')}
-                    Years of Experience: {row.get('Years_of_Experience', 'N/A')}
-                    Achievements: {row.get('Achievements', 'N/A')}
-                    Education: {row.get('Education', 'N/A')}
-                    Certifications: {row.get('Certifications', 'N/A')}
-                    """
-                    
-                    profile_id = f"profile_{row.get('Name', '').lower().replace(' ', '_')}_{processed}"
-                    metadata = {
-                        "name": str(row.get('Name', 'N/A')),
-                        "role": str(row.get('Role', 'N/A')),
-                        "location": str(row.get('Location', 'N/A')),
-                        "skills": str(row.get('Skills', 'N/A')),
-                        "years_experience": str(row.get('Years_of_Experience', 'N/A')),
-                        "education": str(row.get('Education', 'N/A'))
-                    }
-                    
-                    collection.add(
-                        documents=[profile_text],
-                        metadatas=[metadata],
-                        ids=[profile_id]
-                    )
-                    processed += 1
-                except Exception as e:
-                    st.error(f"Error processing profile {row.get('Name', 'unknown')}: {str(e)}")
-            
-            st.success(f" Successfully loaded {processed} profiles into ChromaDB")
+# Background jobs are tied to this id; it lives in the URL so a refreshed page finds its jobs again
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = st.query_params.get("session") or uuid.uuid4().hex
+    st.query_params["session"] = st.session_state.session_id
+    
+if 'applied_jobs' not in st.session_state:
+    st.session_state.applied_jobs = set()
+
+DB_PATH = 'data/chromadb_data'
+
+def get_hr_tasks():
+    """This session's HRTasks: its agents are built once per session and its stage latencies are this recruiter's own"""
+    if 'hr_tasks' not in st.session_state:
+        st.session_state.hr_tasks = HRTasks()
+    return st.session_state.hr_tasks
+
+@st.cache_resource
+def get_shared_db_manager():
+    from utils.db import get_db_manager
+    return get_db_manager(path=DB_PATH)
+
+# Long stages run as background jobs (utils.jobs): the *_job functions run off the script thread,
+# so they must not touch st.*; apply_finished_jobs copies their results into the session.
+
+@retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=4, max=10), reraise=True)
+def load_profiles_job(report, batch_size=None):
+    from utils.db import get_db_manager
+    from utils.ingestion import load_profiles, DEFAULT_BATCH_SIZE
+    report(0.05, "Reading candidate spreadsheet")
+    return load_profiles("data/cs_engineers.xlsx", batch_size=batch_size or DEFAULT_BATCH_SIZE,
+                         db_manager=get_db_manager(path=DB_PATH), log=lambda message: report(None, message))
+
+def ingest_pdfs_job(report, files):
+    from utils.db import get_db_manager
+    from utils.ingestion import ingest_pdfs
+    return ingest_pdfs(
+        files,
+        progress_callback=lambda done, total, name: report(done / total, f"Processed {done}/{total}: {name}"),
+        db_manager=get_db_manager(path=DB_PATH),
+        log=print
+    )
+
+def screen_cvs_job(report, job_role):
+    report(0.1, f"Screening candidates for {job_role}")
+    hr_tasks = HRTasks()
+    screening = str(hr_tasks.run_screen_cvs(job_role))
+    return {"screening": screening, "stage_timings": hr_tasks.stage_timings}
+
+def generate_report_job(report):
+    report(0.1, "Writing the recruitment report")
+    return build_report()
+
+def start_job(kind, fn, *args, label=None):
+    get_job_runner().submit(st.session_state.session_id, kind, fn, *args, label=label)
+    # Rerun so the sidebar starts polling and the stage's buttons reflect the running job
+    st.rerun()
+
+def job_active(kind):
+    return any(job["kind"] == kind for job in get_job_runner().active(st.session_state.session_id))
+
+def apply_finished_jobs(notify=True):
+    """Copy the results of this session's finished jobs into session state, once per job"""
+    for job in get_job_runner().jobs(st.session_state.session_id):
+        if job["status"] not in FINISHED_STATES or job["id"] in st.session_state.applied_jobs:
+            continue
+        st.session_state.applied_jobs.add(job["id"])
+        
+        if job["status"] != DONE:
+            if notify:
+                st.toast(f"{job['label']} failed: {job['error']}")
+            continue
+        
+        result = job["result"]
+        message = f"{job['label']} finished"
+        if job["kind"] == "load_profiles":
             st.session_state.profiles_loaded = True
-            return processed
-        except Exception as e:
-            st.error(f"Error loading profiles: {str(e)}")
-            return 0
+            message = (f"Synced {result['total']} profiles into ChromaDB: {result['added']} added, "
+                       f"{result['changed']} changed, {result['deleted']} removed "
+                       f"({result['rows_per_second']:.1f} rows/s)")
+            if result['failed']:
+                message += f"; failed to write {result['failed']} profiles"
+        elif job["kind"] == "ingest_pdfs":
+            if result['processed'] > 0:
+                st.session_state.profiles_loaded = True
+            message = (f"Embedded {result['processed']} resumes into database "
+                       f"({result['duplicates']} duplicates skipped, {result['failed']} failed)")
+        elif job["kind"] == "screen_cvs":
+            from agents.reporting_agent import ReportingAgent
+            st.session_state.recruitment_data["screening"] = result["screening"]
+            ReportingAgent.add_context('screening', result["screening"])
+            get_hr_tasks().stage_timings.update(result["stage_timings"])
+            st.session_state.cvs_screened = True
+        elif job["kind"] == "generate_report":
+            st.session_state.recruitment_data["report"] = result
+            st.session_state.final_report = result
+            st.session_state.report_generated = True
+        if notify:
+            st.toast(message)
+
+def load_synthetic_profiles(batch_size=None):
+    start_job("load_profiles", load_profiles_job, batch_size, label="Loading candidate database")
 
 def display_chat_messages():
     for message in st.session_state.chat_history:
@@ -212,23 +256,43 @@ def display_chat_messages():
             st.markdown(f'<div class="agent-message">{message["content"]}</div>', unsafe_allow_html=True)
 
 def handle_hr_query(query):
-    hr_tasks = HRTasks()
+    from crewai import Crew
+    from utils.result_cache import get_result_cache, result_key
+    from utils.streaming import stream_crew
+    hr_tasks = get_hr_tasks()
     
     st.session_state.chat_history.append({"role": "user", "content": query})
     
     message_placeholder = st.empty()
     message_placeholder.markdown('<div class="agent-message">Processing your query...</div>', unsafe_allow_html=True)
     
+    def render(text, status):
+        status_line = f'<br><small><i>{status}</i></small>' if status else ""
+        cursor = " ▌" if status else ""
+        message_placeholder.markdown(f'<div class="agent-message">{text}{cursor}{status_line}</div>',
+                                     unsafe_allow_html=True)
+    
     try:
-        response_crew = Crew(
-            agents=[hr_tasks.query_response_agent(st.session_state.recruitment_data)],
-            tasks=[hr_tasks.answer_hr_query(query, st.session_state.recruitment_data)],
-            verbose=True
-        )
+        # The same question over the same pipeline state and data gets the same answer
+        context = hashlib.sha256(json.dumps(st.session_state.recruitment_data, sort_keys=True, default=str)
+                                 .encode("utf-8")).hexdigest()
+        version = get_shared_db_manager().collection_version("linkedin_profiles")
+        key = result_key("hr_chat", query, version=version, context=context)
         
-        answer = response_crew.kickoff()
+        answer = get_result_cache().get(key)
+        if answer is None:
+            response_crew = Crew(
+                agents=[hr_tasks.query_response_agent(st.session_state.recruitment_data)],
+                tasks=[hr_tasks.answer_hr_query(query, st.session_state.recruitment_data)],
+                verbose=True
+            )
+            answer, timings = stream_crew(response_crew, render)
+            get_result_cache().put(key, answer)
+            st.session_state.last_chat_timings = timings
+        else:
+            st.session_state.last_chat_timings = {"ttft": 0.0, "total": 0.0, "cached": True}
         
-        st.session_state.chat_history.append({"role": "assistant", "content": str(answer)})
+        st.session_state.chat_history.append({"role": "assistant", "content": answer})
     except Exception as e:
         error_message = f"I'm sorry, I encountered an issue processing your query. Error: {str(e)}"
         st.session_state.chat_history.append({"role": "assistant", "content": error_message})
@@ -237,36 +301,23 @@ def handle_hr_query(query):
     
     display_chat_messages()
     
-def generate_report():
+def build_report():
+    from crewai import Crew, Process
     hr_tasks = HRTasks()
-    
-    with st.spinner("Generating comprehensive recruitment report..."):
-        reporting_crew = Crew(
-            agents=[hr_tasks.reporting_agent()],
-            tasks=[hr_tasks.generate_report()],
-            verbose=True,
-            process=Process.sequential
-        )
-        
-        final_report = reporting_crew.kickoff()
-        
-        st.session_state.recruitment_data["report"] = str(final_report)
-        st.session_state.final_report = str(final_report)
-        st.session_state.report_generated = True
-        
-        return final_report
+    reporting_crew = Crew(
+        agents=[hr_tasks.reporting_agent()],
+        tasks=[hr_tasks.generate_report()],
+        verbose=True,
+        process=Process.sequential
+    )
+    return str(reporting_crew.kickoff())
 
 def process_job_role(job_role):
-    hr_tasks = HRTasks()
+    from agents.reporting_agent import ReportingAgent
+    hr_tasks = get_hr_tasks()
     
     with st.spinner("Interpreting job role..."):
-        query_crew = Crew(
-            agents=[hr_tasks.hr_query_agent()],
-            tasks=[hr_tasks.handle_hr_query(job_role)],
-            verbose=True
-        )
-        
-        crew_output = query_crew.kickoff()
+        crew_output = hr_tasks.run_handle_hr_query(job_role)
         job_details = str(crew_output)
         interpreted_job_role = job_details.strip().replace("Job Role:", "").strip()
         
@@ -277,16 +328,11 @@ def process_job_role(job_role):
         return interpreted_job_role
 
 def find_profiles(job_role):
-    hr_tasks = HRTasks()
+    from agents.reporting_agent import ReportingAgent
+    hr_tasks = get_hr_tasks()
     
     with st.spinner("Searching for matching profiles..."):
-        profile_crew = Crew(
-            agents=[hr_tasks.profile_finder_agent()],
-            tasks=[hr_tasks.find_profiles(job_role)],
-            verbose=True
-        )
-        
-        similar_profiles = profile_crew.kickoff()
+        similar_profiles = hr_tasks.run_find_profiles(job_role)
         
         st.session_state.recruitment_data["profiles"] = str(similar_profiles)
         ReportingAgent.add_context('profiles', str(similar_profiles))
@@ -295,25 +341,12 @@ def find_profiles(job_role):
         return similar_profiles
 
 def screen_cvs(job_role):
-    hr_tasks = HRTasks()
-    
-    with st.spinner("Screening candidate CVs..."):
-        screening_crew = Crew(
-            agents=[hr_tasks.cv_screening_agent()],
-            tasks=[hr_tasks.screen_cvs(job_role)],
-            verbose=True
-        )
-        
-        screened_results = screening_crew.kickoff()
-        
-        st.session_state.recruitment_data["screening"] = str(screened_results)
-        ReportingAgent.add_context('screening', str(screened_results))
-        st.session_state.cvs_screened = True
-        
-        return screened_results
+    start_job("screen_cvs", screen_cvs_job, job_role, label="Screening CVs")
 
 def schedule_interviews():
-    hr_tasks = HRTasks()
+    from crewai import Crew
+    from agents.reporting_agent import ReportingAgent
+    hr_tasks = get_hr_tasks()
     
     with st.spinner("Scheduling interviews..."):
         candidate_emails = [" ", " "]
@@ -335,6 +368,7 @@ def schedule_interviews():
         return scheduling_results
 
 def export_report_to_pdf(report_text):
+    from fpdf import FPDF
     report_str = str(report_text)
     
     pdf = FPDF()
@@ -363,40 +397,22 @@ def create_download_link(pdf_data, filename):
 
 
 def process_uploaded_pdfs(uploaded_files):
-    with st.spinner(f"Extracting and embedding {len(uploaded_files)} resumes..."):
-        processed = 0
-        db_manager = DBManager(path='data/chromadb_data')
-        collection = db_manager.get_collection("linkedin_profiles")
-        
-        for file in uploaded_files:
-            try:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                
-                profile_id = f"pdf_{file.name.replace(' ', '_')}_{random.randint(1000, 9999)}"
-                metadata = {
-                    "name": file.name.replace('.pdf', ''),
-                    "role": "PDF Candidate", 
-                    "location": "Unknown",
-                    "skills": "Extracted from PDF",
-                    "years_experience": "0", 
-                    "education": "Extracted from PDF"
-                }
-                
-                collection.add(
-                    documents=[text],
-                    metadatas=[metadata],
-                    ids=[profile_id]
-                )
-                processed += 1
-            except Exception as e:
-                st.error(f"Error processing {file.name}: {str(e)}")
-                
-        if processed > 0:
-            st.session_state.profiles_loaded = True
-        return processed
+    # Read the uploads now; the file objects belong to this script run
+    files = [(file.name, file.getvalue()) for file in uploaded_files]
+    start_job("ingest_pdfs", ingest_pdfs_job, files, label=f"Ingesting {len(files)} resumes")
+
+def render_job_status():
+    jobs = get_job_runner().jobs(st.session_state.session_id)
+    for job in jobs:
+        if job["status"] not in FINISHED_STATES:
+            st.progress(job["progress"], text=f"{job['label']}: {job['message'] or job['status']}")
+    if any(job["status"] in FINISHED_STATES and job["id"] not in st.session_state.applied_jobs for job in jobs):
+        # A job finished since the last run: rerun the whole page so it picks up the results
+        st.rerun()
+
+# The first run of a session (e.g. after a refresh) restores earlier results without re-announcing them
+apply_finished_jobs(notify="jobs_restored" in st.session_state)
+st.session_state.jobs_restored = True
 
 with st.sidebar:
     st.image("https://img.icons8.com/fluency/96/000000/human-resources.png")
@@ -410,13 +426,16 @@ with st.sidebar:
     st.markdown("Upload Resumes")
     uploaded_pdfs = st.file_uploader("Drop candidate PDFs here", type="pdf", accept_multiple_files=True)
     if uploaded_pdfs:
-        if st.button("Process Uploaded PDFs"):
-            num_processed = process_uploaded_pdfs(uploaded_pdfs)
-            st.success(f" Embedded {num_processed} resumes into database!")
+        if st.button("Process Uploaded PDFs", disabled=job_active("ingest_pdfs")):
+            process_uploaded_pdfs(uploaded_pdfs)
 
     st.markdown("---")
     st.markdown("Workflow Status")
     
+    # Poll only while something is running, so an idle page does not rerun
+    polling = 2 if get_job_runner().active(st.session_state.session_id) else None
+    st.fragment(run_every=polling)(render_job_status)()
+    
     if st.session_state.profiles_loaded:
         st.success("Profiles Database Ready")
     else:
@@ -447,9 +466,19 @@ with st.sidebar:
     else:
         st.warning("Report Not Generated")
     
+    if get_hr_tasks().stage_timings:
+        st.caption(get_hr_tasks().timing_report().replace("\n", "  \n"))
+    if AgentRegistry.metrics:
+        st.caption(AgentRegistry.construction_report().replace("\n", "  \n"))
+    
 def render_analytics_dashboard():
+    import plotly.express as px
+    from utils.db import timing_summary
+    from utils.http_cache import get_response_cache
+    from utils.result_cache import get_result_cache
+    from utils.streaming import streaming_summary
     try:
-        db_manager = DBManager(path='data/chromadb_data')
+        db_manager = get_shared_db_manager()
         collection = db_manager.get_collection("linkedin_profiles")
         
         data = collection.get()
@@ -493,6 +522,25 @@ def render_analytics_dashboard():
                 fig_loc.update_layout(plot_bgcolor="white", paper_bgcolor="white")
                 st.plotly_chart(fig_loc, use_container_width=True)
                 
+        with st.expander("Database Latency"):
+            timings = timing_summary()
+            st.write(f"Client open: {timings['client_open']['mean_ms']:.1f} ms "
+                     f"({timings['client_open']['count']} opens)")
+            st.write(f"Collection open: {timings['collection_open']['mean_ms']:.1f} ms "
+                     f"({timings['collection_open']['count']} opens)")
+            st.write(f"Query: {timings['query']['mean_ms']:.1f} ms mean, "
+                     f"{timings['query']['max_ms']:.1f} ms max ({timings['query']['count']} queries)")
+            api_cache = get_response_cache().stats()
+            st.write(f"API response cache: {api_cache['hits']} hits, {api_cache['misses']} misses, "
+                     f"{api_cache['revalidated']} revalidated, {api_cache['entries']} entries")
+            result_cache = get_result_cache().stats()
+            st.write(f"Search result cache: {result_cache['hits']} hits, {result_cache['misses']} misses "
+                     f"({result_cache['hit_rate']:.0%} hit rate), {result_cache['entries']} entries")
+            chat = streaming_summary()
+            st.write(f"Chat time to first token: {chat['ttft']['mean_ms']:.0f} ms mean, "
+                     f"{chat['ttft']['max_ms']:.0f} ms max; full answer {chat['total']['mean_ms']:.0f} ms mean "
+                     f"({chat['total']['count']} answers)")
+                
     except Exception as e:
         st.error(f"Could not load analytics: {str(e)}")
 
@@ -501,10 +549,8 @@ if page == "Dashboard":
     st.markdown("Streamline your recruitment process with AI-powered automation")
     
     if not st.session_state.profiles_loaded:
-        if st.button("Load Candidate Database"):
-            num_profiles = load_synthetic_profiles()
-            if num_profiles > 0:
-                st.success(f"Successfully loaded {num_profiles} profiles into the database")
+        if st.button("Load Candidate Database", disabled=job_active("load_profiles")):
+            load_synthetic_profiles()
     
     with st.form("job_role_form"):
         job_role_input = st.text_input("Enter Job Role to Search For:", placeholder="e.g., Senior Python Developer")
@@ -532,11 +578,10 @@ if page == "Dashboard":
     with col2:
         st.markdown("### 2. Screen Candidates")
         if st.session_state.profiles_found and not st.session_state.cvs_screened:
-            if st.button("Screen CVs"):
-                screened_results = screen_cvs(st.session_state.job_role)
-                st.success("CV screening completed!")
-                with st.expander("Show Screening Results"):
-                    st.text(screened_results)
+            if job_active("screen_cvs"):
+                st.info("Screening in progress...")
+            elif st.button("Screen CVs"):
+                screen_cvs(st.session_state.job_role)
         elif st.session_state.cvs_screened:
             st.success("Candidates Screened")
             with st.expander("Show Screening Results"):
@@ -556,6 +601,22 @@ if page == "Dashboard":
                 st.text(st.session_state.recruitment_data.get("scheduling", "No scheduling data available"))
 
 
+    with st.expander("Batch Requisition Matching"):
+        requisitions_input = st.text_area("One job description per line:",
+                                          placeholder="Senior Python Developer, Delhi, 5+ years\nDevOps Engineer with Kubernetes")
+        if st.button("Match Requisitions") and requisitions_input.strip():
+            job_descriptions = [line.strip() for line in requisitions_input.splitlines() if line.strip()]
+            from agents.cv_screening_agent import CVScreeningAgent
+            with st.spinner(f"Matching {len(job_descriptions)} requisitions..."):
+                shortlists = CVScreeningAgent.batch_screen_requisitions(job_descriptions, shortlist_size=5)
+            for job_description, shortlist in shortlists.items():
+                st.markdown(f"**{job_description}**")
+                if shortlist is None or shortlist.empty:
+                    st.info("No matching profiles found.")
+                else:
+                    st.dataframe(shortlist[['name', 'role', 'location', 'years_experience', 'matched_skills',
+                                            'score', 'recommendation']], use_container_width=True)
+
     if st.session_state.profiles_loaded:
         render_analytics_dashboard()
 
@@ -564,13 +625,10 @@ if page == "Dashboard":
         if st.session_state.interviews_scheduled:
             st.markdown("### Final Report")
             if not st.session_state.report_generated:
-                if st.button("Generate Comprehensive Report"):
-                    report = generate_report()
-                    st.success("Final report generated!")
-                    st.markdown("### Recruitment Report")
-                    st.text(report)
-                    pdf_data = export_report_to_pdf(report)
-                    st.markdown(create_download_link(pdf_data, "recruitment_report.pdf"), unsafe_allow_html=True)
+                if job_active("generate_report"):
+                    st.info("Report generation in progress...")
+                elif st.button("Generate Comprehensive Report"):
+                    start_job("generate_report", generate_report_job, label="Generating report")
             else:
                 st.markdown("### Recruitment Report")
                 st.text(st.session_state.final_report)
@@ -583,10 +641,8 @@ elif page == "Chat Assistant":
     
     if not st.session_state.profiles_loaded:
         st.warning("Please load the candidate database first from the Dashboard")
-        if st.button("Load Candidate Database"):
-            num_profiles = load_synthetic_profiles()
-            if num_profiles > 0:
-                st.success(f"Successfully loaded {num_profiles} profiles into the database")
+        if st.button("Load Candidate Database", disabled=job_active("load_profiles")):
+            load_synthetic_profiles()
     
     st.markdown("### Chat with HR Assistant")
     
@@ -611,6 +667,12 @@ elif page == "Chat Assistant":
     if send_button and chat_input:
         handle_hr_query(chat_input)
     
+    pending_query = st.session_state.get("pending_report_query")
+    if pending_query and not job_active("generate_report"):
+        del st.session_state.pending_report_query
+        if st.session_state.report_generated:
+            handle_hr_query(pending_query)
+    
     st.markdown("### Quick Actions")
     quick_actions = st.columns(3)
     
@@ -619,13 +681,24 @@ elif page == "Chat Assistant":
             handle_hr_query("Who are the top candidates for the position?")
     
     with quick_actions[1]:
-        if st.button("Generate Report"):
-            report = generate_report() if not st.session_state.report_generated else st.session_state.final_report
-            handle_hr_query("Show me the comprehensive recruitment report")
+        if st.button("Generate Report", disabled=job_active("generate_report")):
+            if st.session_state.report_generated:
+                handle_hr_query("Show me the comprehensive recruitment report")
+            else:
+                # Ask once the background report job has finished and apply_finished_jobs stored it
+                st.session_state.pending_report_query = "Show me the comprehensive recruitment report"
+                start_job("generate_report", generate_report_job, label="Generating report")
     
     with quick_actions[2]:
         if st.button("Candidate Statistics"):
             handle_hr_query("Give me statistics about the candidate pool")
+    
+    timings = st.session_state.get("last_chat_timings")
+    if timings:
+        if timings.get("cached"):
+            st.caption("Last answer served from cache")
+        else:
+            st.caption(f"Last answer: first token after {timings['ttft']:.2f}s, complete after {timings['total']:.2f}s")
 
 if __name__ == "__main__":
     pass
@@ -1,213 +1,143 @@
-import PyPDF2
-import random
 from dotenv import load_dotenv
-from tasks.hr_tasks import HRTasks
-from crewai import Crew, Process
+from tasks.hr_tasks import HRTasks, AgentRegistry
 import os
-import pandas as pd
-from utils.db import DBManager
-from langchain_mistralai import MistralAIEmbeddings
+import argparse
 
 load_dotenv()
 
-def load_synthetic_profiles():
+def load_synthetic_profiles(batch_size=None):
+    from utils.ingestion import load_profiles, DEFAULT_BATCH_SIZE
     print("\n LOADING SYNTHETIC PROFILES ")
-    
-    profiles_df = None
-    approaches = [
-        lambda: pd.read_excel("data/cs_engineers.xlsx"),
-        lambda: pd.read_excel("data/cs_engineers.xlsx", sheet_name=0),
-        lambda: pd.read_excel("data/cs_engineers.xlsx", na_filter=False),
-        lambda: pd.read_excel("data/cs_engineers.xlsx", 
-                             names=['Name', 'Role', 'Location', 'Skills', 'Years_of_Experience', 
-                                   'Achievements', 'Education', 'Certifications'])
-    ]
-    
-    for i, approach in enumerate(approaches):
-        try:
-            profiles_df = approach()
-            print(f"Successfully loaded {len(profiles_df)} profiles using approach #{i+1}")
-            break
-        except Exception as e:
-            print(f"Approach #{i+1} failed: {str(e)}")
-            
-    if profiles_df is None:
-        print("All parsing attempts failed. Could not load profiles.")
-        return 0
-    
-    try:
-        required_columns = ['Name', 'Role', 'Location', 'Skills', 'Years_of_Experience', 
-                           'Achievements', 'Education', 'Certifications']
-        for col in required_columns:
-            if col not in profiles_df.columns:
-                print(f"Missing column: {col}")
-                
-        if 'Years_of_Experience' in profiles_df.columns:
-            profiles_df['Years_of_Experience'] = pd.to_numeric(profiles_df['Years_of_Experience'], errors='coerce')
-    except Exception as e:
-        print(f"Error during data cleanup: {str(e)}")
-    
-    db_manager = DBManager(path='data/chromadb_data')
-    try:
-        db_manager.client.delete_collection("linkedin_profiles")
-        print("Deleted existing ChromaDB collection")
-    except:
-        print("No existing collection to delete")
-    
-    collection = db_manager.get_collection("linkedin_profiles")
-    
-    embedding_fn = MistralAIEmbeddings(model="mistral-embed", api_key=os.getenv('MISTRAL_API_KEY'))
-    
-    processed = 0
-    for _, row in profiles_df.iterrows():
-        try:
-            profile_text = f"""
-            Name: {row.get('Name', 'N/A')}
-            Role: {row.get('Role', 'N/A')}
-            Location: {row.get('Location', 'N/A')}
-            Skills: {row.get('Skills', 'N/A')}
-            Years of Experience: {row.get('Years_of_Experience', 'N/A')}
-            Achievements: {row.get('Achievements', 'N/A')}
-            Education: {row.get('Education', 'N/A')}
-            Certifications: {row.get('Certifications', 'N/A')}
-            """
-            
-            profile_id = f"profile_{row.get('Name', '').lower().replace(' ', '_')}_{processed}"
-            
-            metadata = {
-                "name": str(row.get('Name', 'N/A')),
-                "role": str(row.get('Role', 'N/A')),
-                "location": str(row.get('Location', 'N/A')),
-                "skills": str(row.get('Skills', 'N/A')),
-                "years_experience": str(row.get('Years_of_Experience', 'N/A')),
-                "education": str(row.get('Education', 'N/A'))
-            }
-            
-            collection.add(
-                documents=[profile_text],
-                metadatas=[metadata],
-                ids=[profile_id]
-            )
-            processed += 1
-        except Exception as e:
-            print(f"Error processing profile {row.get('Name', 'unknown')}: {str(e)}")
-    
-    print(f"Successfully loaded {processed} profiles into ChromaDB")
-    return processed
 
-def process_uploaded_pdfs(pdf_file_paths):
+    stats = load_profiles("data/cs_engineers.xlsx", batch_size=batch_size or DEFAULT_BATCH_SIZE)
+
+    print(f"Synced {stats['total']} profiles into ChromaDB: {stats['added']} added, "
+          f"{stats['changed']} changed, {stats['unchanged']} unchanged, {stats['deleted']} removed "
+          f"({stats['rows_per_second']:.1f} rows/s)")
+    cache = stats.get('embedding_cache', {})
+    print(f"Embedding cache: {cache.get('hits', 0)} hits, {cache.get('misses', 0)} misses, "
+          f"{cache.get('entries', 0)} entries")
+    return stats['total'] - stats['failed']
+
+def process_uploaded_pdfs(pdf_file_paths, workers=None):
+    from utils.ingestion import ingest_pdfs, DEFAULT_WORKERS
     print(f"\nEXTRACTING AND EMBEDDING {len(pdf_file_paths)} RESUMES ")
-    processed = 0
-    db_manager = DBManager(path='data/chromadb_data')
-    collection = db_manager.get_collection("linkedin_profiles")
-    
-    for file_path in pdf_file_paths:
-        try:
-            pdf_reader = PyPDF2.PdfReader(file_path)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            
-            file_name = os.path.basename(file_path)
-            
-            profile_id = f"pdf_{file_name.replace(' ', '_')}_{random.randint(1000, 9999)}"
-            metadata = {
-                "name": file_name.replace('.pdf', ''),
-                "role": "PDF Candidate", 
-                "location": "Unknown",
-                "skills": "Extracted from PDF",
-                "years_experience": "0", 
-                "education": "Extracted from PDF"
-            }
-            
-            collection.add(
-                documents=[text],
-                metadatas=[metadata],
-                ids=[profile_id]
-            )
-            processed += 1
-            print(f"  - Successfully processed: {file_name}")
-        except Exception as e:
-            print(f"  - Error processing {file_path}: {str(e)}")
-            
-    print(f"Successfully loaded {processed} PDF profiles into ChromaDB")
-    return processed
-
-def main():
+
+    def report_progress(done, total, name):
+        print(f"  - [{done}/{total}] {name}")
+
+    stats = ingest_pdfs(
+        [(os.path.basename(file_path), file_path) for file_path in pdf_file_paths],
+        workers=workers or DEFAULT_WORKERS,
+        progress_callback=report_progress
+    )
+
+    print(f"Successfully loaded {stats['processed']} PDF profiles into ChromaDB "
+          f"({stats['duplicates']} duplicates skipped)")
+    return stats['processed']
+
+def run_batch_matching(requisitions_path, shortlist_size=5):
+    """Match every requisition in a text file (one job description per line) in a single pass"""
+    from agents.cv_screening_agent import CVScreeningAgent
+
+    with open(requisitions_path, encoding="utf-8") as f:
+        job_descriptions = [line.strip() for line in f if line.strip()]
+
+    print(f"\nMATCHING {len(job_descriptions)} REQUISITIONS ")
+    print(CVScreeningAgent.batch_screen_report(job_descriptions, shortlist_size=shortlist_size))
+
+def main(execution_mode=None):
+    from crewai import Crew, Process
+    from agents.reporting_agent import ReportingAgent
+    from utils.pipeline import run_stages, waterfall
     recruitment_data = {}
     
     hr_query = input("HR, please enter your job-role query: ")
 
-    hr_tasks = HRTasks()
+    hr_tasks = HRTasks(mode=execution_mode)
 
-    query_crew = Crew(
-        agents=[hr_tasks.hr_query_agent()],
-        tasks=[hr_tasks.handle_hr_query(hr_query)],
-        verbose=True
-    )
+    def interpret_query(_):
+        crew_output = hr_tasks.run_handle_hr_query(hr_query)
+        job_details = str(crew_output)
+        job_role = job_details.strip().replace("Job Role:", "").strip()
+        
+        print(f"Interpreted job role: {job_role}")
+        
+        recruitment_data["job_role"] = job_role
+        ReportingAgent.add_context('job_role', job_role)
+        return job_role
 
-    crew_output = query_crew.kickoff()
-    job_details = str(crew_output)
-    job_role = job_details.strip().replace("Job Role:", "").strip()
-    
-    print(f"Interpreted job role: {job_role}")
-    
-    recruitment_data["job_role"] = job_role
-    from agents.reporting_agent import ReportingAgent
-    ReportingAgent.add_context('job_role', job_role)
+    def load_database(_):
+        print("\nLoading synthetic profiles from CSV into ChromaDB...")
+        num_profiles = load_synthetic_profiles()
+        print(f"Loaded {num_profiles} synthetic profiles into the database.")
+        return num_profiles
 
-    print("\nLoading synthetic profiles from CSV into ChromaDB...")
-    num_profiles = load_synthetic_profiles()
-    print(f"Loaded {num_profiles} synthetic profiles into the database.")
-    
-    profile_crew = Crew(
-        agents=[hr_tasks.profile_finder_agent()],
-        tasks=[hr_tasks.find_profiles(hr_query)],
-        verbose=True
-    )
-    similar_profiles = profile_crew.kickoff()
-    print("Similar profiles retrieved:")
-    print(similar_profiles)
-    
-    recruitment_data["profiles"] = str(similar_profiles)
-    ReportingAgent.add_context('profiles', str(similar_profiles))
+    def find_profiles(_):
+        similar_profiles = hr_tasks.run_find_profiles(hr_query)
+        print("Similar profiles retrieved:")
+        print(similar_profiles)
+        
+        recruitment_data["profiles"] = str(similar_profiles)
+        ReportingAgent.add_context('profiles', str(similar_profiles))
+        return similar_profiles
 
-    screening_crew = Crew(
-        agents=[hr_tasks.cv_screening_agent()],
-        tasks=[hr_tasks.screen_cvs(job_role)],
-        verbose=True
-    )
-    screened_results = screening_crew.kickoff()
-    print("Screened CV results:")
-    print(screened_results)
-    
-    recruitment_data["screening"] = str(screened_results)
-    ReportingAgent.add_context('screening', str(screened_results))
-
-    candidate_emails = ["", ""]
-    scheduling_crew = Crew(
-        agents=[hr_tasks.gmail_scheduler_agent()],
-        tasks=[hr_tasks.schedule_interviews(candidate_emails, job_role=job_role)],
-        verbose=True
-    )
-    scheduling_results = scheduling_crew.kickoff()
-    print("Scheduling results:")
-    print(scheduling_results)
-    
-    recruitment_data["scheduling"] = str(scheduling_results)
-    ReportingAgent.add_context('scheduling', str(scheduling_results))
-
-    reporting_crew = Crew(
-        agents=[hr_tasks.reporting_agent()],
-        tasks=[hr_tasks.generate_report()],
-        verbose=True,
-        process=Process.sequential
-    )
-    final_report = reporting_crew.kickoff()
-    print("Final Recruitment Report:")
-    print(final_report)
-    
-    recruitment_data["report"] = str(final_report)
+    def screen_cvs(inputs):
+        screened_results = hr_tasks.run_screen_cvs(inputs["interpret_query"])
+        print("Screened CV results:")
+        print(screened_results)
+        
+        recruitment_data["screening"] = str(screened_results)
+        ReportingAgent.add_context('screening', str(screened_results))
+        return screened_results
+
+    def schedule_interviews(inputs):
+        candidate_emails = ["", ""]
+        scheduling_crew = Crew(
+            agents=[hr_tasks.gmail_scheduler_agent()],
+            tasks=[hr_tasks.schedule_interviews(candidate_emails, job_role=inputs["interpret_query"])],
+            verbose=True
+        )
+        scheduling_results = scheduling_crew.kickoff()
+        print("Scheduling results:")
+        print(scheduling_results)
+        
+        recruitment_data["scheduling"] = str(scheduling_results)
+        ReportingAgent.add_context('scheduling', str(scheduling_results))
+        return scheduling_results
+
+    def generate_report(_):
+        reporting_crew = Crew(
+            agents=[hr_tasks.reporting_agent()],
+            tasks=[hr_tasks.generate_report()],
+            verbose=True,
+            process=Process.sequential
+        )
+        final_report = reporting_crew.kickoff()
+        print("Final Recruitment Report:")
+        print(final_report)
+        
+        recruitment_data["report"] = str(final_report)
+        return final_report
+
+    # Each stage starts as soon as what it reads is ready: the database loads while the
+    # query is interpreted, and profile search (which uses the raw query) overlaps screening
+    stages = {
+        "interpret_query": (interpret_query, []),
+        "load_database": (load_database, []),
+        "find_profiles": (find_profiles, ["load_database"]),
+        "screen_cvs": (screen_cvs, ["interpret_query", "load_database"]),
+        "schedule_interviews": (schedule_interviews, ["screen_cvs"]),
+        "generate_report": (generate_report, ["find_profiles", "schedule_interviews"]),
+    }
+    try:
+        _, timings = run_stages(stages)
+    except Exception as e:
+        print(waterfall(getattr(e, "timings", {})))
+        raise
+    print(waterfall(timings))
+    print(hr_tasks.timing_report())
+    print(AgentRegistry.construction_report())
 
     print("\n\n HR Interactive Query Mode ")
     print("You can now ask questions about the recruitment process, candidates, or reports.")
@@ -230,4 +160,14 @@ def main():
         print(str(answer))
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="ProAcquis recruitment pipeline")
+    parser.add_argument("--requisitions", help="Text file with one job description per line to batch-match")
+    parser.add_argument("--shortlist-size", type=int, default=5)
+    parser.add_argument("--mode", choices=["direct", "agent"],
+                        help="Run search/screening directly or through the LLM agents (default: PROACQUIS_EXECUTION_MODE or direct)")
+    args = parser.parse_args()
+
+    if args.requisitions:
+        run_batch_matching(args.requisitions, shortlist_size=args.shortlist_size)
+    else:
+        main(execution_mode=args.mode)
@@ -1,39 +1,182 @@
-from crewai import Agent, Task
-from agents.cv_screening_agent import CVScreeningAgent
-from agents.reporting_agent import ReportingAgent
-from agents.hr_query_agent import HRQueryAgent
-from agents.linkedin_search_agent import LinkedInSearchAgent, search_linkedin_profiles
-from agents.linkedin_data_collector_agent import LinkedInDataCollectorAgent
-from agents.profile_finder_agent import ProfileFinderAgent
-from agents.gmail_scheduler_agent import GmailSchedulerAgent
-from agents.query_response_agent import QueryResponseAgent
+import os
+import time
+import threading
+from utils.query_filters import resolve_filters
+from utils.llm import llm_config_key, llm_stats
+
+EXECUTION_MODES = ("direct", "agent")
+
+
+class AgentRegistry:
+    """Builds each CrewAI agent once per registry and LLM config, then hands out the same instance.
+
+    Every HRTasks owns a registry, and the app keeps one HRTasks per Streamlit
+    session (background jobs and CLI runs make their own). A Crew rebinds
+    agent.crew and agent.agent_executor on every agent it runs, so one instance
+    must never serve two crews at once; a session runs one crew at a time. The
+    LLM client behind the agents, which holds the warm HTTP connections, is
+    shared process-wide by utils.llm.get_llm.
+    """
+    metrics = {}
+    _metrics_lock = threading.Lock()
+
+    def __init__(self):
+        self._agents = {}
+        self._lock = threading.Lock()
+
+    def get(self, name, agent_class):
+        """agent_class.agent() builds the agent; its llm_config (model and options) is part of the key"""
+        key = (name, llm_config_key(**getattr(agent_class, "llm_config", {})))
+        with AgentRegistry._metrics_lock:
+            entry = AgentRegistry.metrics.setdefault(name, {"builds": 0, "reuses": 0, "build_seconds": 0.0})
+        with self._lock:
+            agent = self._agents.get(key)
+            if agent is not None:
+                with AgentRegistry._metrics_lock:
+                    entry["reuses"] += 1
+                return agent
+
+            start = time.perf_counter()
+            agent = agent_class.agent()
+            with AgentRegistry._metrics_lock:
+                entry["builds"] += 1
+                entry["build_seconds"] += time.perf_counter() - start
+            self._agents[key] = agent
+            return agent
+
+    def clear(self):
+        with self._lock:
+            self._agents.clear()
+
+    @staticmethod
+    def construction_report():
+        lines = ["Agent construction:"]
+        for name, entry in AgentRegistry.metrics.items():
+            lines.append(f"  {name}: built {entry['builds']}x in {entry['build_seconds']:.2f}s, "
+                         f"reused {entry['reuses']}x")
+        llms = llm_stats()
+        lines.append(f"  LLM clients: {llms['clients']} built in {llms['build_seconds']:.2f}s, "
+                     f"reused {llms['reuses']}x")
+        return "\n".join(lines)
+
 
 class HRTasks:
+    def __init__(self, mode=None):
+        self.mode = mode or os.getenv("PROACQUIS_EXECUTION_MODE", "direct")
+        # Per instance, so concurrent runs (sessions, background jobs) never report each other's stages
+        self.stage_timings = {}
+        self.agents = AgentRegistry()
+        if self.mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{self.mode}', expected one of {EXECUTION_MODES}")
+
+    def _run_stage(self, stage, build_crew, direct=None):
+        """Run a stage directly when possible, else (or on failure) through a crew, recording latency"""
+        start = time.perf_counter()
+        used_mode = "agent"
+        result = None
+
+        if self.mode == "direct" and direct is not None:
+            try:
+                result = direct()
+                if isinstance(result, str) and result.startswith("Error"):
+                    print(f"Direct {stage} failed, falling back to agent: {result}")
+                    result = None
+                else:
+                    used_mode = "direct"
+            except Exception as e:
+                print(f"Direct {stage} failed, falling back to agent: {str(e)}")
+
+        if result is None:
+            result = build_crew().kickoff()
+
+        elapsed = time.perf_counter() - start
+        self.stage_timings[stage] = {"mode": used_mode, "seconds": elapsed}
+        print(f"[{stage}] {used_mode} mode: {elapsed:.2f}s")
+        return result
+
+    def run_handle_hr_query(self, hr_query):
+        from crewai import Crew
+        from agents.hr_query_agent import HRQueryAgent
+        # Free-text interpretation needs the LLM unless an equivalent query was interpreted recently
+        start = time.perf_counter()
+        cached = HRQueryAgent.cached_interpretation(hr_query)
+        if cached is not None:
+            elapsed = time.perf_counter() - start
+            self.stage_timings["interpret_query"] = {"mode": "cache", "seconds": elapsed}
+            print(f"[interpret_query] cache mode: {elapsed:.2f}s")
+            return cached
+
+        result = self._run_stage(
+            "interpret_query",
+            lambda: Crew(agents=[self.hr_query_agent()], tasks=[self.handle_hr_query(hr_query)], verbose=True)
+        )
+        HRQueryAgent.store_interpretation(hr_query, str(result))
+        return result
+
+    def run_find_profiles(self, job_description, top_k=5):
+        from crewai import Crew
+        from agents.profile_finder_agent import ProfileFinderAgent
+        return self._run_stage(
+            "find_profiles",
+            lambda: Crew(agents=[self.profile_finder_agent()], tasks=[self.find_profiles(job_description)],
+                         verbose=True),
+            direct=lambda: ProfileFinderAgent.search_profiles(
+                job_description, top_k, filters=resolve_filters(job_description))
+        )
+
+    def run_screen_cvs(self, job_role, top_k=5):
+        from crewai import Crew
+        from agents.cv_screening_agent import CVScreeningAgent
+        return self._run_stage(
+            "screen_cvs",
+            lambda: Crew(agents=[self.cv_screening_agent()], tasks=[self.screen_cvs(job_role)], verbose=True),
+            direct=lambda: CVScreeningAgent.search_and_screen_profiles(
+                job_role, top_k, filters=resolve_filters(job_role))
+        )
+
+    def timing_report(self):
+        lines = ["Stage latency:"]
+        for stage, timing in self.stage_timings.items():
+            lines.append(f"  {stage}: {timing['seconds']:.2f}s ({timing['mode']} mode)")
+        return "\n".join(lines)
+
     def hr_query_agent(self):
-        return HRQueryAgent.agent()
+        from agents.hr_query_agent import HRQueryAgent
+        return self.agents.get("hr_query", HRQueryAgent)
 
     def cv_screening_agent(self):
-        return CVScreeningAgent.agent()
+        from agents.cv_screening_agent import CVScreeningAgent
+        return self.agents.get("cv_screening", CVScreeningAgent)
 
     def reporting_agent(self):
-        return ReportingAgent.agent()
+        from agents.reporting_agent import ReportingAgent
+        return self.agents.get("reporting", ReportingAgent)
 
     def linkedin_search_agent(self):
-        return LinkedInSearchAgent.agent()
+        from agents.linkedin_search_agent import LinkedInSearchAgent
+        return self.agents.get("linkedin_search", LinkedInSearchAgent)
 
     def linkedin_data_collector_agent(self):
-        return LinkedInDataCollectorAgent.agent()
+        from agents.linkedin_data_collector_agent import LinkedInDataCollectorAgent
+        return self.agents.get("linkedin_data_collector", LinkedInDataCollectorAgent)
 
     def profile_finder_agent(self):
-        return ProfileFinderAgent.agent()
+        from agents.profile_finder_agent import ProfileFinderAgent
+        return self.agents.get("profile_finder", ProfileFinderAgent)
 
     def gmail_scheduler_agent(self):
-        return GmailSchedulerAgent.agent()
+        from agents.gmail_scheduler_agent import GmailSchedulerAgent
+        return self.agents.get("gmail_scheduler", GmailSchedulerAgent)
 
     def query_response_agent(self, recruitment_data):
-        return QueryResponseAgent.agent(recruitment_data)
+        from agents.query_response_agent import QueryResponseAgent
+        # The tools read recruitment data from the class, so the cached agent only needs it refreshed
+        if recruitment_data:
+            QueryResponseAgent.recruitment_data = recruitment_data
+        return self.agents.get("query_response", QueryResponseAgent)
 
     def handle_hr_query(self, hr_query):
+        from crewai import Task
         return Task(
             description=(f"Interpret this HR query: '{hr_query}'. Clearly specify the exact job role and essential skills. "
                          "Pass these details to subsequent tasks."),
@@ -42,6 +185,7 @@ class HRTasks:
         )
 
     def run_linkedin_search(self, query):
+        from crewai import Task
         return Task(
             description=f"Search for LinkedIn usernames using query: '{query}'.",
             agent=self.linkedin_search_agent(),
@@ -49,6 +193,7 @@ class HRTasks:
         )
 
     def populate_database(self, usernames):
+        from crewai import Task
         usernames_str = ", ".join(usernames) if isinstance(usernames, list) else str(usernames)
         
         return Task(
@@ -58,6 +203,7 @@ class HRTasks:
         )
 
     def find_profiles(self, job_description):
+        from crewai import Task
         return Task(
             description=f"Search the candidate profiles in the database that are similar to: '{job_description}'.",
             agent=self.profile_finder_agent(),
@@ -65,6 +211,7 @@ class HRTasks:
         )
 
     def schedule_interviews(self, candidate_emails, job_role="Software Engineer"):
+        from crewai import Task
         emails_str = ", ".join(candidate_emails) if isinstance(candidate_emails, list) else str(candidate_emails)
         
         return Task(
@@ -74,6 +221,7 @@ class HRTasks:
         )
 
     def screen_cvs(self, job_role):
+        from crewai import Task
         return Task(
             description=f"Screen candidate CVs for the '{job_role}' position. Evaluate technical skills, experience, and education. Rank candidates based on their suitability.",
             agent=self.cv_screening_agent(),
@@ -81,6 +229,7 @@ class HRTasks:
         )
 
     def generate_report(self):
+        from crewai import Task
         return Task(
             description="Generate a comprehensive report on the recruitment process, candidate evaluations, and recommendations.",
             agent=self.reporting_agent(),
@@ -88,6 +237,7 @@ class HRTasks:
         )
 
     def answer_hr_query(self, query, recruitment_data):
+        from crewai import Task
         return Task(
             description=f"Answer the following HR query: '{query}'. Provide detailed information based on the available recruitment data.",
             agent=self.query_response_agent(recruitment_data),
@@ -1,8 +1,305 @@
+import os
+import re
+import time
+import threading
 import chromadb
+from chromadb.errors import NotFoundError
+from utils.embedding_cache import get_embedding_function
+from utils.lexical_index import LexicalIndex, reciprocal_rank_fusion
+
+DEFAULT_DB_PATH = 'data/chromadb_data'
+REEMBED_BATCH_SIZE = 500
+# Filtered keyword search checks BM25 hits against `where` in chunks of this many times the
+# wanted count, for at most this many chunks, so its cost never grows with the collection
+KEYWORD_OVERFETCH = 4
+KEYWORD_FILTER_ROUNDS = 5
+
+_clients = {}
+_collections = {}
+_lexical_indexes = {}
+_versions = {}
+_key_locks = {}
+# Guards the pool dicts only; slow work (opening, migrating, backfilling) holds a per-key lock
+_pool_lock = threading.RLock()
+_timings = {"client_open": [], "collection_open": [], "query": [], "hybrid_query": []}
+
+
+def _record(kind, seconds):
+    samples = _timings[kind]
+    samples.append(seconds)
+    if len(samples) > 1000:
+        del samples[:len(samples) - 1000]
+
+
+def _key_lock(*key):
+    with _pool_lock:
+        return _key_locks.setdefault(key, threading.RLock())
+
+
+def get_client(path=DEFAULT_DB_PATH):
+    """Return the process-wide PersistentClient for `path`, opening it on first use"""
+    key = os.path.abspath(path)
+    client = _clients.get(key)
+    if client is None:
+        with _pool_lock:
+            client = _clients.get(key)
+            if client is None:
+                start = time.perf_counter()
+                client = chromadb.PersistentClient(path=path)
+                _record("client_open", time.perf_counter() - start)
+                _clients[key] = client
+    return client
+
 
 class DBManager:
-    def __init__(self, path='data/chromadb_data'):
-        self.client = chromadb.PersistentClient(path=path)
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = os.path.abspath(path)
+        self.client = get_client(path)
 
     def get_collection(self, collection_name):
-        return self.client.get_or_create_collection(name=collection_name)
+        key = (self.path, collection_name)
+        collection = _collections.get(key)
+        if collection is not None:
+            return collection
+
+        with _key_lock("collection", *key):
+            collection = _collections.get(key)
+            if collection is None:
+                start = time.perf_counter()
+                collection = self._open_collection(collection_name)
+                _record("collection_open", time.perf_counter() - start)
+                _collections[key] = collection
+        return collection
+
+    def _open_collection(self, collection_name):
+        embedding_function = get_embedding_function()
+        try:
+            existing = self.client.get_collection(name=collection_name)
+        except NotFoundError:
+            return self.client.get_or_create_collection(
+                name=collection_name,
+                embedding_function=embedding_function,
+                metadata={"embedding_model": embedding_function.model_name}
+            )
+
+        if not self.embedding_model_matches(existing):
+            # Vectors from another embedding model cannot be queried with ours, and re-embedding
+            # is far too slow to run inside whichever request happens to open the collection
+            stored = (existing.metadata or {}).get("embedding_model", "the default embedder")
+            raise RuntimeError(
+                f"Collection '{collection_name}' was embedded with {stored}, not {embedding_function.model_name}; "
+                f"reload the candidate database (or call migrate_embeddings) to re-embed it"
+            )
+        return self.client.get_collection(name=collection_name, embedding_function=embedding_function)
+
+    def migrate_embeddings(self, collection_name, log=print):
+        """Re-embed the collection if it was built with another model; returns True if it did.
+
+        Writers (load_profiles, ingest_pdfs, the LinkedIn collector) call this
+        first, from their own job or thread. Only this collection is locked
+        while it runs, so its readers wait and every other collection is free.
+        """
+        key = (self.path, collection_name)
+        with _key_lock("collection", *key):
+            if key in _collections:
+                return False
+            try:
+                existing = self.client.get_collection(name=collection_name)
+            except NotFoundError:
+                return False
+            if self.embedding_model_matches(existing):
+                return False
+            _collections[key] = self._reembed_collection(existing, get_embedding_function(), log=log)
+            return True
+
+    def _reembed_collection(self, existing, embedding_function, batch_size=REEMBED_BATCH_SIZE, log=print):
+        """Copy every row (whatever its source) into a collection embedded with the current model, then swap it in.
+
+        The old collection is only dropped once the copy holds all of its rows;
+        if anything fails it is left untouched and the error is raised.
+        """
+        collection_name = existing.name
+        model_name = embedding_function.model_name
+        staging_name = f"{collection_name}__{re.sub(r'[^a-zA-Z0-9._-]', '_', model_name)}"
+        total = existing.count()
+        log(f"Re-embedding collection '{collection_name}' ({total} documents) with {model_name}")
+
+        try:
+            # Leftover from an interrupted migration
+            self.client.delete_collection(staging_name)
+        except Exception:
+            pass
+
+        staging = self.client.create_collection(
+            name=staging_name,
+            embedding_function=embedding_function,
+            metadata=dict(existing.metadata or {}, embedding_model=model_name)
+        )
+        try:
+            for offset in range(0, total, batch_size):
+                batch = existing.get(include=["documents", "metadatas"], limit=batch_size, offset=offset)
+                staging.upsert(ids=batch['ids'], documents=batch['documents'], metadatas=batch['metadatas'])
+            if staging.count() != total:
+                raise RuntimeError(f"copied {staging.count()} of {total} documents")
+        except Exception as e:
+            self.client.delete_collection(staging_name)
+            raise RuntimeError(f"Could not re-embed collection '{collection_name}', left it unchanged: {str(e)}")
+
+        self.client.delete_collection(collection_name)
+        staging.modify(name=collection_name)
+        self.bump_version(collection_name)
+        log(f"Re-embedded {total} documents into '{collection_name}'")
+        return self.client.get_collection(name=collection_name, embedding_function=embedding_function)
+
+    def delete_collection(self, collection_name):
+        with _key_lock("collection", self.path, collection_name):
+            _collections.pop((self.path, collection_name), None)
+            self.client.delete_collection(collection_name)
+        self.lexical_index(collection_name, backfill=False).clear()
+        self.bump_version(collection_name)
+
+    def collection_version(self, collection_name):
+        """Counter bumped by every write path, used to key cached results so they never outlive a change"""
+        return _versions.get((self.path, collection_name), 0)
+
+    def bump_version(self, collection_name):
+        key = (self.path, collection_name)
+        with _pool_lock:
+            _versions[key] = _versions.get(key, 0) + 1
+            return _versions[key]
+
+    def lexical_index(self, collection_name, backfill=True):
+        """BM25 index kept alongside the collection; backfilled on first use if it is out of step"""
+        key = (self.path, collection_name)
+        index = _lexical_indexes.get(key)
+        if index is not None:
+            return index
+
+        with _key_lock("lexical", *key):
+            index = _lexical_indexes.get(key)
+            if index is None:
+                index = LexicalIndex(os.path.join(f"{self.path}_lexical", f"{collection_name}.sqlite"))
+                # Published only once backfilled, so searches wait here instead of reading a partial index;
+                # a failed backfill is retried by the next caller
+                if not backfill or self._backfill_lexical_index(collection_name, index):
+                    _lexical_indexes[key] = index
+        return index
+
+    def _backfill_lexical_index(self, collection_name, index, batch_size=1000):
+        try:
+            collection = self.get_collection(collection_name)
+            total = collection.count()
+            if total == index.count():
+                return True
+            index.clear()
+            for offset in range(0, total, batch_size):
+                batch = collection.get(include=["documents"], limit=batch_size, offset=offset)
+                index.upsert(batch['ids'], batch['documents'])
+            print(f"Rebuilt keyword index for '{collection_name}' ({total} documents)")
+            return True
+        except Exception as e:
+            print(f"Could not backfill keyword index for '{collection_name}': {str(e)}")
+            return False
+
+    def hybrid_query(self, collection_name, query_text, n_results=5, where=None, candidates=None):
+        """Vector and BM25 retrieval fused with reciprocal rank fusion, shaped like a single collection.query result.
+
+        Each retriever contributes its best `candidates` (default 4x n_results)
+        hits that satisfy `where`; keyword hits are drawn from the top
+        KEYWORD_OVERFETCH x KEYWORD_FILTER_ROUNDS x candidates BM25 matches.
+        """
+        candidates = candidates or max(4 * n_results, 20)
+        collection = self.get_collection(collection_name)
+        start = time.perf_counter()
+        try:
+            vector = self.query(collection_name, query_texts=[query_text], n_results=candidates, where=where)
+            vector_ids = vector['ids'][0] if vector and vector['ids'] else []
+
+            keyword_ids = self._keyword_ids(collection, collection_name, query_text, candidates, where)
+
+            fused = reciprocal_rank_fusion([vector_ids, keyword_ids])[:n_results]
+            ids = [doc_id for doc_id, _ in fused]
+
+            rows = {}
+            for i, doc_id in enumerate(vector_ids):
+                rows[doc_id] = (vector['documents'][0][i], vector['metadatas'][0][i], vector['distances'][0][i])
+            missing = [doc_id for doc_id in ids if doc_id not in rows]
+            if missing:
+                fetched = collection.get(ids=missing, include=["documents", "metadatas"])
+                for doc_id, document, metadata in zip(fetched['ids'], fetched['documents'], fetched['metadatas']):
+                    rows[doc_id] = (document, metadata, None)
+            ids = [doc_id for doc_id in ids if doc_id in rows]
+
+            return {
+                "ids": [ids],
+                "documents": [[rows[doc_id][0] for doc_id in ids]],
+                "metadatas": [[rows[doc_id][1] for doc_id in ids]],
+                "distances": [[rows[doc_id][2] for doc_id in ids]],
+                "scores": [[score for doc_id, score in fused if doc_id in rows]],
+                "keyword_ranks": [[keyword_ids.index(doc_id) + 1 if doc_id in keyword_ids else None
+                                   for doc_id in ids]],
+            }
+        finally:
+            _record("hybrid_query", time.perf_counter() - start)
+
+    def _keyword_ids(self, collection, collection_name, query_text, candidates, where=None):
+        """Best `candidates` BM25 hits, keeping only those that pass `where`"""
+        index = self.lexical_index(collection_name)
+        if not where:
+            return [doc_id for doc_id, _ in index.search(query_text, candidates)]
+
+        chunk = candidates * KEYWORD_OVERFETCH
+        ranked = [doc_id for doc_id, _ in index.search(query_text, chunk * KEYWORD_FILTER_ROUNDS)]
+        kept = []
+        for offset in range(0, len(ranked), chunk):
+            batch = ranked[offset:offset + chunk]
+            allowed = set(collection.get(ids=batch, where=where, include=[])['ids'])
+            kept.extend(doc_id for doc_id in batch if doc_id in allowed)
+            if len(kept) >= candidates:
+                break
+        return kept[:candidates]
+
+    def query(self, collection_name, **kwargs):
+        """collection.query on the pooled handle, recording query latency"""
+        collection = self.get_collection(collection_name)
+        start = time.perf_counter()
+        try:
+            return collection.query(**kwargs)
+        finally:
+            _record("query", time.perf_counter() - start)
+
+    def embedding_model_matches(self, collection):
+        """Whether the collection's vectors were produced by the configured embedding model"""
+        metadata = collection.metadata or {}
+        return metadata.get("embedding_model") == get_embedding_function().model_name
+
+    def embedding_cache_stats(self):
+        return get_embedding_function().cache.stats()
+
+
+_managers = {}
+
+
+def get_db_manager(path=DEFAULT_DB_PATH):
+    """Shared DBManager for `path`; cheap to call on every request"""
+    key = os.path.abspath(path)
+    manager = _managers.get(key)
+    if manager is None:
+        with _pool_lock:
+            manager = _managers.setdefault(key, DBManager(path))
+    return manager
+
+
+def timing_summary():
+    """Mean/max/count in milliseconds for client opens, collection opens and queries"""
+    summary = {}
+    for kind, samples in _timings.items():
+        if samples:
+            summary[kind] = {
+                "count": len(samples),
+                "mean_ms": 1000 * sum(samples) / len(samples),
+                "max_ms": 1000 * max(samples)
+            }
+        else:
+            summary[kind] = {"count": 0, "mean_ms": 0.0, "max_ms": 0.0}
+    return summary
@@ -0,0 +1,158 @@
+import os
+import time
+import queue
+import smtplib
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+
+DEFAULT_SMTP_HOST = os.getenv("PROACQUIS_SMTP_HOST", "smtp.gmail.com")
+DEFAULT_SMTP_PORT = int(os.getenv("PROACQUIS_SMTP_PORT", "587"))
+DEFAULT_POOL_SIZE = int(os.getenv("PROACQUIS_SMTP_POOL_SIZE", "4"))
+DEFAULT_MAX_RETRIES = int(os.getenv("PROACQUIS_SMTP_RETRIES", "3"))
+IDLE_CHECK_SECONDS = 30
+
+
+class SMTPTransport:
+    """Opens logged-in SMTP connections. Swap in another object with `connect()` to send elsewhere.
+
+    With PROACQUIS_SMTP_TLS=0 and no credentials it talks plain SMTP, which is
+    what a local stand-in such as `python -m aiosmtpd -n -l localhost:8025` expects.
+    """
+
+    def __init__(self, host=DEFAULT_SMTP_HOST, port=DEFAULT_SMTP_PORT, username=None, password=None,
+                 use_tls=None, timeout=30):
+        self.host = host
+        self.port = port
+        self.username = username if username is not None else os.getenv("GMAIL_SENDER")
+        self.password = password if password is not None else os.getenv("GMAIL_PASSWORD")
+        self.use_tls = use_tls if use_tls is not None else os.getenv("PROACQUIS_SMTP_TLS", "1") == "1"
+        self.timeout = timeout
+
+    def connect(self):
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            connection.starttls()
+        if self.username and self.password:
+            connection.login(self.username, self.password)
+        return connection
+
+
+class SMTPConnectionPool:
+    """A small pool of SMTP connections opened on demand and reopened when the server drops them"""
+
+    def __init__(self, transport, size=DEFAULT_POOL_SIZE):
+        self.transport = transport
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.connects = 0
+
+    def _open(self):
+        connection = self.transport.connect()
+        self.connects += 1
+        return connection
+
+    def _is_alive(self, connection):
+        try:
+            return connection.noop()[0] == 250
+        except Exception:
+            return False
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        connection = None
+        try:
+            try:
+                connection, last_used = self._idle.get_nowait()
+                # A connection idle for a while may have been closed by the server
+                if time.monotonic() - last_used > IDLE_CHECK_SECONDS and not self._is_alive(connection):
+                    self._discard(connection)
+                    connection = None
+            except queue.Empty:
+                pass
+            if connection is None:
+                connection = self._open()
+
+            try:
+                yield connection
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+                # The server answered, so the connection is still usable
+                raise
+            except Exception:
+                self._discard(connection)
+                connection = None
+                raise
+        finally:
+            if connection is not None:
+                self._idle.put((connection, time.monotonic()))
+            self._slots.release()
+
+    def _discard(self, connection):
+        try:
+            connection.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(connection)
+
+
+def build_message(sender, recipient, subject, body):
+    msg = MIMEText(body)
+    msg['Subject'] = subject
+    msg['From'] = sender
+    msg['To'] = recipient
+    return msg
+
+
+class EmailDispatcher:
+    """Sends messages over a connection pool with bounded concurrency and per-recipient retry"""
+
+    def __init__(self, transport=None, pool_size=DEFAULT_POOL_SIZE, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff_seconds=0.5):
+        self.pool = SMTPConnectionPool(transport or SMTPTransport(), pool_size)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+    def send(self, msg):
+        """Send one message, reconnecting and retrying with exponential backoff; returns (ok, error)"""
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+            try:
+                with self.pool.connection() as connection:
+                    connection.send_message(msg)
+                return True, None
+            except smtplib.SMTPRecipientsRefused as e:
+                # Retrying will not make a bad address valid
+                return False, str(e)
+            except smtplib.SMTPResponseException as e:
+                if e.smtp_code >= 500:
+                    return False, str(e)
+                error = str(e)
+                print(f"Send to {msg['To']} deferred (attempt {attempt + 1}/{self.max_retries + 1}): {error}")
+            except Exception as e:
+                error = str(e)
+                print(f"Send to {msg['To']} failed (attempt {attempt + 1}/{self.max_retries + 1}): {error}")
+        return False, error
+
+    def send_many(self, messages):
+        """Send messages concurrently (one worker per pooled connection); returns [(recipient, ok, error)]"""
+        if not messages:
+            return []
+        workers = min(self.pool.size, len(messages))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(self.send, messages))
+        return [(msg['To'], ok, error) for msg, (ok, error) in zip(messages, outcomes)]
+
+    def close(self):
+        self.pool.close()
@@ -0,0 +1,154 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from array import array
+from chromadb.api.types import EmbeddingFunction, Documents, Embeddings
+
+DEFAULT_EMBEDDING_MODEL = os.getenv("PROACQUIS_EMBEDDING_MODEL", "mistral-embed")
+DEFAULT_CACHE_PATH = os.getenv("PROACQUIS_EMBEDDING_CACHE", "data/embedding_cache.sqlite")
+DEFAULT_MAX_ENTRIES = int(os.getenv("PROACQUIS_EMBEDDING_CACHE_MAX", "500000"))
+
+
+class EmbeddingCache:
+    """On-disk embedding store keyed by sha256(model, text) with LRU eviction"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    @staticmethod
+    def make_key(text, model):
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, texts, model):
+        """Return a list aligned with `texts` holding cached vectors or None"""
+        keys = [self.make_key(text, model) for text in texts]
+        found = {}
+        with self._lock:
+            unique_keys = list(dict.fromkeys(keys))
+            for offset in range(0, len(unique_keys), 500):
+                chunk = unique_keys[offset:offset + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    vector = array('f')
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+
+            if found:
+                now = time.time()
+                self._conn.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?",
+                                       [(now, key) for key in found])
+                self._conn.commit()
+
+            results = [found.get(key) for key in keys]
+            hit_count = sum(1 for vector in results if vector is not None)
+            self.hits += hit_count
+            self.misses += len(results) - hit_count
+        return results
+
+    def put_many(self, texts, model, vectors):
+        now = time.time()
+        rows = [(self.make_key(text, model), model, array('f', vector).tobytes(), now)
+                for text, vector in zip(texts, vectors)]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO embeddings VALUES (?, ?, ?, ?)", rows)
+            self._count += self._conn.total_changes - before
+            self._conn.commit()
+            if self._count > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        # Trim to 90% of the bound so eviction does not run on every insert
+        target = int(self.max_entries * 0.9)
+        excess = self._count - target
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN "
+            "(SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)", (excess,)
+        )
+        self._conn.commit()
+        self.evictions += excess
+        self._count = target
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": self._count,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions
+        }
+
+
+def _base_embedder(model_name):
+    if model_name.startswith("mistral"):
+        from langchain_mistralai import MistralAIEmbeddings
+        embeddings = MistralAIEmbeddings(model=model_name, api_key=os.getenv('MISTRAL_API_KEY'))
+        return embeddings.embed_documents
+
+    from chromadb.utils import embedding_functions
+    default_fn = embedding_functions.DefaultEmbeddingFunction()
+    return lambda texts: [list(map(float, vector)) for vector in default_fn(texts)]
+
+
+class CachedEmbeddingFunction(EmbeddingFunction[Documents]):
+    """ChromaDB embedding function that only embeds texts missing from the cache"""
+
+    def __init__(self, model_name=DEFAULT_EMBEDDING_MODEL, cache=None, embedder=None):
+        self.model_name = model_name
+        self.cache = cache or EmbeddingCache()
+        self._embedder = embedder
+
+    def __call__(self, input: Documents) -> Embeddings:
+        texts = list(input)
+        vectors = self.cache.get_many(texts, self.model_name)
+
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        if missing:
+            if self._embedder is None:
+                self._embedder = _base_embedder(self.model_name)
+            fresh = dict(zip(missing, self._embedder(missing)))
+            self.cache.put_many(list(fresh.keys()), self.model_name, list(fresh.values()))
+            vectors = [vector if vector is not None else fresh[text] for text, vector in zip(texts, vectors)]
+
+        return vectors
+
+
+_embedding_function = None
+_embedding_function_lock = threading.Lock()
+
+
+def get_embedding_function():
+    """Process-wide cached embedding function shared by every collection handle"""
+    global _embedding_function
+    if _embedding_function is None:
+        with _embedding_function_lock:
+            if _embedding_function is None:
+                _embedding_function = CachedEmbeddingFunction()
+    return _embedding_function
@@ -0,0 +1,110 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+
+DEFAULT_HTTP_CACHE_PATH = os.getenv("PROACQUIS_HTTP_CACHE", "data/http_cache.sqlite")
+DEFAULT_HTTP_CACHE_MAX = int(os.getenv("PROACQUIS_HTTP_CACHE_MAX", "20000"))
+
+
+class ResponseCache:
+    """Disk cache of successful API responses keyed by method, URL and request body.
+
+    Each entry carries the TTL it was stored with. Stale entries are kept so a
+    request can be revalidated with If-None-Match / If-Modified-Since; when the
+    store exceeds `max_entries`, the least recently used entries are evicted.
+    """
+
+    def __init__(self, path=DEFAULT_HTTP_CACHE_PATH, max_entries=DEFAULT_HTTP_CACHE_MAX):
+        self.max_entries = max_entries
+        self.counters = {"hits": 0, "misses": 0, "stale": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, url TEXT NOT NULL, status INTEGER NOT NULL, headers TEXT NOT NULL, "
+            "body BLOB NOT NULL, stored_at REAL NOT NULL, ttl REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(method, url, body=None):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return hashlib.sha256(method.upper().encode() + b"\0" + url.encode("utf-8") + b"\0" + (body or b"")).hexdigest()
+
+    def lookup(self, key):
+        """Return (status, headers, body, fresh) for a stored response, or None"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT status, headers, body, stored_at, ttl FROM responses WHERE key = ?",
+                                     (key,)).fetchone()
+            if row is None:
+                self.counters["misses"] += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            fresh = now - row[3] <= row[4]
+            self.counters["hits" if fresh else "stale"] += 1
+        return row[0], json.loads(row[1]), zlib.decompress(row[2]), fresh
+
+    def store(self, key, url, status, headers, body, ttl):
+        now = time.time()
+        with self._lock:
+            existed = self._conn.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, status, json.dumps(headers), zlib.compress(body, 6), now, ttl, now)
+            )
+            if not existed:
+                self._count += 1
+            self.counters["stores"] += 1
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, key):
+        """A 304 revalidation: the stored body is current again for another TTL"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE responses SET stored_at = ?, last_used = ? WHERE key = ?", (now, now, key))
+            self._conn.commit()
+            self.counters["revalidated"] += 1
+
+    def _evict(self):
+        if self._count <= self.max_entries:
+            return
+        # Evict down to 90% of the bound so we don't evict on every insert
+        excess = self._count - int(self.max_entries * 0.9)
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used LIMIT ?)", (excess,)
+        )
+        self._count -= excess
+        self.counters["evictions"] += excess
+
+    def stats(self):
+        return dict(self.counters, entries=self._count)
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Process-wide cache shared by every API client"""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
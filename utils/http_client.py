@@ -0,0 +1,172 @@
+import json
+import time
+import threading
+import http.client
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """Allows `rate` calls per second on average with bursts of up to `capacity`; shared across threads"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, self.rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def header_value(headers, name):
+    """Case-insensitive header lookup; servers differ on ETag vs Etag vs etag"""
+    name = name.lower()
+    return next((value for key, value in headers.items() if key.lower() == name), None)
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def text(self):
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class KeepAliveClient:
+    """HTTP client for one API that keeps a persistent connection per thread.
+
+    Every request waits on the optional `rate_limiter`. 429 and 5xx responses,
+    as well as dropped connections, are retried with exponential backoff
+    (honouring Retry-After). `base_url` may point at a local mock server,
+    e.g. "http://127.0.0.1:8000".
+
+    With a `cache` (see utils.http_cache), 200 responses are kept for
+    `cache_ttl` seconds and served without touching the network or the rate
+    limiter; stale entries are revalidated with ETag / Last-Modified. APIs
+    that report quota or errors with a 200 need a `cache_validator`
+    (Response -> bool): only responses it accepts are cached.
+    """
+
+    def __init__(self, base_url, headers=None, rate_limiter=None, max_retries=3, backoff_seconds=1.0, timeout=30,
+                 cache=None, cache_ttl=0, cache_validator=None):
+        parsed = urlsplit(base_url)
+        self.scheme = parsed.scheme or "https"
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip("/")
+        self.headers = dict(headers or {})
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout = timeout
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.cache_validator = cache_validator
+        self.base_url = base_url.rstrip("/")
+        self.stats = {"requests": 0, "retries": 0, "connects": 0, "cache_hits": 0}
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            connection = connection_class(self.host, self.port, timeout=self.timeout)
+            self._local.connection = connection
+            self._count("connects")
+        return connection
+
+    def _reset(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _backoff(self, attempt, retry_after=None):
+        try:
+            wait = float(retry_after)
+        except (TypeError, ValueError):
+            wait = self.backoff_seconds * 2 ** attempt
+        self._count("retries")
+        time.sleep(wait)
+
+    def request(self, method, path, body=None, headers=None, cache_ttl=None, cache_validator=None):
+        """Send a request, or answer it from the cache; `cache_ttl` overrides the client's TTL (0 skips the cache)
+        and `cache_validator` the client's validator"""
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body, sort_keys=True)
+        request_headers = dict(self.headers, **(headers or {}))
+        ttl = self.cache_ttl if cache_ttl is None else cache_ttl
+        if self.cache is None or ttl <= 0:
+            return self._send(method, path, body, request_headers)
+
+        url = self.base_url + path
+        key = self.cache.make_key(method, url, body)
+        cached = self.cache.lookup(key)
+        if cached is not None:
+            status, cached_headers, cached_body, fresh = cached
+            if fresh:
+                self._count("cache_hits")
+                return Response(status, cached_headers, cached_body)
+            etag = header_value(cached_headers, "ETag")
+            last_modified = header_value(cached_headers, "Last-Modified")
+            if etag:
+                request_headers["If-None-Match"] = etag
+            if last_modified:
+                request_headers["If-Modified-Since"] = last_modified
+
+        response = self._send(method, path, body, request_headers)
+        if response.status == 304 and cached is not None:
+            self.cache.touch(key)
+            return Response(cached[0], cached[1], cached[2])
+        validator = cache_validator or self.cache_validator
+        if response.status == 200 and (validator is None or validator(response)):
+            self.cache.store(key, url, response.status, response.headers, response.body, ttl)
+        return response
+
+    def _send(self, method, path, body, request_headers):
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            self._count("requests")
+            try:
+                connection = self._connection()
+                connection.request(method, self.base_path + path, body=body, headers=request_headers)
+                res = connection.getresponse()
+                data = res.read()
+            except (http.client.HTTPException, OSError) as e:
+                self._reset()
+                if attempt == self.max_retries:
+                    raise ConnectionError(f"{method} {path} failed after {attempt + 1} attempts: {str(e)}")
+                self._backoff(attempt)
+                continue
+
+            if res.getheader("Connection", "").lower() == "close":
+                self._reset()
+            if (res.status == 429 or res.status >= 500) and attempt < self.max_retries:
+                self._backoff(attempt, res.getheader("Retry-After"))
+                continue
+            return Response(res.status, dict(res.getheaders()), data)
+
+    def close(self):
+        self._reset()
@@ -0,0 +1,479 @@
+import os
+import time
+import hashlib
+import pandas as pd
+from utils.db import get_db_manager
+from utils.skills import skill_tokens_string
+from utils.linkedin_profile import flatten_linkedin_profile
+from utils.pdf_extraction import extract_pdfs, DEFAULT_WORKERS, DEFAULT_FILE_TIMEOUT
+
+PROFILE_COLUMNS = ['Name', 'Role', 'Location', 'Skills', 'Years_of_Experience',
+                   'Achievements', 'Education', 'Certifications']
+
+IDENTITY_COLUMNS = ['Name', 'Role', 'Location', 'Education', 'Certifications']
+
+DEFAULT_BATCH_SIZE = int(os.getenv("PROACQUIS_INGEST_BATCH_SIZE", "256"))
+
+# Bump when the stored metadata layout changes so the next sync rewrites every row
+METADATA_VERSION = 3
+
+SPREADSHEET_SOURCE = "spreadsheet"
+PDF_SOURCE = "pdf"
+LINKEDIN_SOURCE = "linkedin"
+
+# Scanned or image-only resumes extract to (almost) nothing; their text hashes would all collide
+MIN_RESUME_TEXT_LENGTH = int(os.getenv("PROACQUIS_MIN_RESUME_TEXT", "50"))
+
+
+def read_profiles_dataframe(path="data/cs_engineers.xlsx", log=print):
+    """Read the candidate spreadsheet, trying progressively more lenient parsers"""
+    approaches = [
+        lambda: pd.read_excel(path),
+        lambda: pd.read_excel(path, sheet_name=0),
+        lambda: pd.read_excel(path, na_filter=False),
+        lambda: pd.read_excel(path, names=PROFILE_COLUMNS)
+    ]
+
+    for i, approach in enumerate(approaches):
+        try:
+            profiles_df = approach()
+            log(f"Successfully loaded {len(profiles_df)} profiles using approach #{i+1}")
+            break
+        except Exception as e:
+            log(f"Approach #{i+1} failed: {str(e)}")
+    else:
+        log("All parsing attempts failed. Could not load profiles.")
+        return None
+
+    for col in PROFILE_COLUMNS:
+        if col not in profiles_df.columns:
+            log(f"Missing column: {col}")
+
+    if 'Years_of_Experience' in profiles_df.columns:
+        profiles_df['Years_of_Experience'] = pd.to_numeric(profiles_df['Years_of_Experience'], errors='coerce')
+
+    return profiles_df
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def content_hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def stable_profile_ids(cols, fingerprints):
+    """Derive row-order independent IDs from the identifying columns of each profile.
+
+    Profiles sharing the same identity are told apart by the rank of their
+    fingerprint, so reordering the spreadsheet never reshuffles IDs.
+    """
+    identities = cols[IDENTITY_COLUMNS].apply(lambda col: col.str.strip().str.lower()).agg('|'.join, axis=1)
+    slugs = cols['Name'].str.lower().str.replace(' ', '_', regex=False)
+    keys = [content_hash(identity)[:16] for identity in identities]
+
+    ordinals = {}
+    for key, fingerprint in sorted(zip(keys, fingerprints)):
+        ordinals.setdefault(key, {}).setdefault(fingerprint, len(ordinals[key]))
+
+    ids = []
+    seen = set()
+    for slug, key, fingerprint in zip(slugs, keys, fingerprints):
+        ordinal = ordinals[key][fingerprint]
+        profile_id = f"profile_{slug}_{key}" if ordinal == 0 else f"profile_{slug}_{key}_{ordinal}"
+        while profile_id in seen:
+            ordinal += 1
+            profile_id = f"profile_{slug}_{key}_{ordinal}"
+        seen.add(profile_id)
+        ids.append(profile_id)
+    return ids
+
+
+def build_profile_records(profiles_df):
+    """Build ids, documents and metadatas for a profiles frame, one column at a time"""
+    frame = profiles_df.reindex(columns=PROFILE_COLUMNS)
+    cols = frame.fillna('N/A').astype(str)
+
+    documents = (
+        "Name: " + cols['Name'] +
+        "\nRole: " + cols['Role'] +
+        "\nLocation: " + cols['Location'] +
+        "\nSkills: " + cols['Skills'] +
+        "\nYears of Experience: " + cols['Years_of_Experience'] +
+        "\nAchievements: " + cols['Achievements'] +
+        "\nEducation: " + cols['Education'] +
+        "\nCertifications: " + cols['Certifications']
+    ).tolist()
+
+    years_experience = pd.to_numeric(frame['Years_of_Experience'], errors='coerce').fillna(0).astype(float)
+
+    fingerprints = [content_hash(f"{METADATA_VERSION}\n{doc}") for doc in documents]
+    ids = stable_profile_ids(cols, fingerprints)
+
+    metadatas = pd.DataFrame({
+        "name": cols['Name'],
+        "role": cols['Role'],
+        "location": cols['Location'],
+        "skills": cols['Skills'],
+        "skill_tokens": cols['Skills'].map(skill_tokens_string),
+        "years_experience": years_experience,
+        "education": cols['Education'],
+        "source": SPREADSHEET_SOURCE,
+        "fingerprint": fingerprints
+    }).to_dict(orient='records')
+
+    return ids, documents, metadatas
+
+
+def upsert_in_batches(collection, ids, documents, metadatas, batch_size=DEFAULT_BATCH_SIZE, log=print,
+                      lexical_index=None):
+    """Upsert records in fixed-size batches and report throughput, keeping `lexical_index` in step"""
+    batch_size = max(1, int(batch_size))
+    written = 0
+    failed = 0
+    start = time.perf_counter()
+
+    for offset in range(0, len(ids), batch_size):
+        end = offset + batch_size
+        try:
+            collection.upsert(
+                ids=ids[offset:end],
+                documents=documents[offset:end],
+                metadatas=metadatas[offset:end]
+            )
+            if lexical_index is not None:
+                lexical_index.upsert(ids[offset:end], documents[offset:end])
+            written += len(ids[offset:end])
+        except Exception as e:
+            failed += len(ids[offset:end])
+            log(f"Error writing batch {offset}-{min(end, len(ids))}: {str(e)}")
+
+    elapsed = time.perf_counter() - start
+    rate = written / elapsed if elapsed > 0 else float(written)
+    log(f"Wrote {written} rows in {elapsed:.2f}s ({rate:.1f} rows/s), {failed} failed")
+
+    return {"rows": written, "failed": failed, "seconds": elapsed, "rows_per_second": rate}
+
+
+def delete_in_batches(collection, ids, batch_size=DEFAULT_BATCH_SIZE, lexical_index=None):
+    batch_size = max(1, int(batch_size))
+    for offset in range(0, len(ids), batch_size):
+        collection.delete(ids=ids[offset:offset + batch_size])
+        if lexical_index is not None:
+            lexical_index.delete(ids[offset:offset + batch_size])
+
+
+# Set once a sync has removed the legacy `profile_*` rows, so later syncs stop looking for them
+LEGACY_IDS_FLAG = "legacy_ids_removed"
+
+
+def existing_fingerprints(collection, source=SPREADSHEET_SOURCE, batch_size=DEFAULT_BATCH_SIZE):
+    """Map ID -> stored fingerprint for every row owned by `source`.
+
+    Rows written before fingerprints existed (legacy `profile_*` IDs) are
+    included with a fingerprint of None so they get replaced. They carry no
+    `source` to filter on, so they are looked for by a full (paged) scan until
+    a sync has removed them and set LEGACY_IDS_FLAG.
+    """
+    owned = {}
+    offset = 0
+    while True:
+        batch = collection.get(where={"source": source}, include=["metadatas"], limit=batch_size, offset=offset)
+        for profile_id, metadata in zip(batch['ids'], batch['metadatas']):
+            owned[profile_id] = (metadata or {}).get('fingerprint')
+        if len(batch['ids']) < batch_size:
+            break
+        offset += batch_size
+
+    if not (collection.metadata or {}).get(LEGACY_IDS_FLAG):
+        for offset in range(0, collection.count(), batch_size):
+            batch = collection.get(include=["metadatas"], limit=batch_size, offset=offset)
+            for profile_id, metadata in zip(batch['ids'], batch['metadatas']):
+                if 'source' not in (metadata or {}) and profile_id.startswith("profile_"):
+                    owned[profile_id] = None
+    return owned
+
+
+def sync_records(collection, ids, documents, metadatas, source=SPREADSHEET_SOURCE,
+                 batch_size=DEFAULT_BATCH_SIZE, full_refresh=False, log=print, lexical_index=None):
+    """Write only added or changed records and delete rows no longer present"""
+    current = existing_fingerprints(collection, source, batch_size=batch_size)
+
+    changed = [i for i, profile_id in enumerate(ids)
+               if full_refresh or current.get(profile_id) != metadatas[i]['fingerprint']]
+    added = sum(1 for i in changed if ids[i] not in current)
+    keep = set(ids)
+    removed = [profile_id for profile_id in current if profile_id not in keep]
+
+    log(f"Sync plan: {added} added, {len(changed) - added} changed, "
+        f"{len(ids) - len(changed)} unchanged, {len(removed)} removed")
+
+    stats = upsert_in_batches(
+        collection,
+        [ids[i] for i in changed],
+        [documents[i] for i in changed],
+        [metadatas[i] for i in changed],
+        batch_size=batch_size,
+        log=log,
+        lexical_index=lexical_index
+    )
+
+    try:
+        delete_in_batches(collection, removed, batch_size=batch_size, lexical_index=lexical_index)
+        if not (collection.metadata or {}).get(LEGACY_IDS_FLAG):
+            collection.modify(metadata={**(collection.metadata or {}), LEGACY_IDS_FLAG: True})
+    except Exception as e:
+        log(f"Error deleting removed profiles: {str(e)}")
+        removed = []
+
+    stats.update({
+        "added": added,
+        "changed": len(changed) - added,
+        "unchanged": len(ids) - len(changed),
+        "deleted": len(removed),
+        "total": len(ids)
+    })
+    return stats
+
+
+YEARS_MIGRATED_FLAG = "numeric_years"
+
+
+def migrate_numeric_years(collection, batch_size=DEFAULT_BATCH_SIZE, log=print):
+    """Rewrite string `years_experience` values left by older loaders as numbers so range filters match them.
+
+    Every current writer stores numbers, so the scan runs once per collection
+    and is then skipped via a flag in the collection metadata.
+    """
+    if (collection.metadata or {}).get(YEARS_MIGRATED_FLAG):
+        return 0
+
+    converted = 0
+    total = collection.count()
+    for offset in range(0, total, batch_size):
+        existing = collection.get(include=["metadatas"], limit=batch_size, offset=offset)
+        ids, metadatas = [], []
+        for profile_id, metadata in zip(existing['ids'], existing['metadatas']):
+            if metadata and isinstance(metadata.get('years_experience'), str):
+                try:
+                    years = float(metadata['years_experience'])
+                except ValueError:
+                    years = 0.0
+                ids.append(profile_id)
+                metadatas.append({**metadata, 'years_experience': years})
+        if ids:
+            # Updating metadata does not reorder rows, so offsets stay valid
+            collection.update(ids=ids, metadatas=metadatas)
+            converted += len(ids)
+
+    collection.modify(metadata={**(collection.metadata or {}), YEARS_MIGRATED_FLAG: True})
+    if converted:
+        log(f"Converted years_experience to a number on {converted} existing profiles")
+    return converted
+
+
+def load_profiles(path="data/cs_engineers.xlsx", collection_name="linkedin_profiles",
+                  batch_size=DEFAULT_BATCH_SIZE, full_refresh=False, db_manager=None, log=print):
+    """Sync the candidate spreadsheet into ChromaDB, embedding only the delta"""
+    profiles_df = read_profiles_dataframe(path, log=log)
+    if profiles_df is None:
+        return {"rows": 0, "failed": 0, "seconds": 0.0, "rows_per_second": 0.0,
+                "added": 0, "changed": 0, "unchanged": 0, "deleted": 0, "total": 0}
+
+    db_manager = db_manager or get_db_manager()
+    db_manager.migrate_embeddings(collection_name, log=log)
+    collection = db_manager.get_collection(collection_name)
+
+    max_batch = getattr(db_manager.client, "get_max_batch_size", None)
+    if max_batch:
+        batch_size = min(batch_size, max_batch())
+
+    ids, documents, metadatas = build_profile_records(profiles_df)
+    stats = sync_records(collection, ids, documents, metadatas, batch_size=batch_size,
+                         full_refresh=full_refresh, log=log,
+                         lexical_index=db_manager.lexical_index(collection_name))
+    migrated = migrate_numeric_years(collection, batch_size=batch_size, log=log)
+    if stats["rows"] or stats["deleted"] or migrated:
+        db_manager.bump_version(collection_name)
+    stats["embedding_cache"] = db_manager.embedding_cache_stats()
+    return stats
+
+
+def normalize_resume_text(text):
+    return " ".join(text.lower().split())
+
+
+def pdf_profile_id(file_hash):
+    return f"pdf_{file_hash[:32]}"
+
+
+def build_pdf_record(name, text, file_hash, fields):
+    """Resume record keyed by the hash of the file bytes, with metadata parsed from the text"""
+    profile_id = pdf_profile_id(file_hash)
+    metadata = {
+        "name": fields["name"],
+        "role": fields["role"],
+        "location": fields["location"],
+        "skills": fields["skills"],
+        "skill_tokens": skill_tokens_string(fields["skills"]),
+        "years_experience": float(fields["years_experience"]),
+        "education": fields["education"],
+        "file_name": name,
+        "source": PDF_SOURCE,
+        "content_hash": content_hash(normalize_resume_text(text))
+    }
+    return profile_id, text, metadata
+
+
+def profile_document(fields):
+    """The same compact text layout as spreadsheet rows, so every source embeds alike"""
+    return (f"Name: {fields['name']}\nRole: {fields['role']}\nLocation: {fields['location']}"
+            f"\nSkills: {fields['skills']}\nYears of Experience: {fields['years_experience']:g}"
+            f"\nAchievements: {fields['achievements']}\nEducation: {fields['education']}"
+            f"\nCertifications: {fields['certifications']}")
+
+
+def build_linkedin_record(username, payload):
+    """LinkedIn record keyed by username, flattened from the API payload into the profile schema"""
+    fields = flatten_linkedin_profile(payload, username)
+    document = profile_document(fields)
+    metadata = {
+        "name": fields["name"],
+        "role": fields["role"],
+        "location": fields["location"],
+        "skills": fields["skills"],
+        "skill_tokens": skill_tokens_string(fields["skills"]),
+        "years_experience": float(fields["years_experience"]),
+        "education": fields["education"],
+        "username": username,
+        "source": LINKEDIN_SOURCE,
+        "content_hash": content_hash(document)
+    }
+    return username, document, metadata
+
+
+def _read_bytes(source):
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    with open(source, "rb") as f:
+        return f.read()
+
+
+def existing_ids(collection, ids, batch_size=DEFAULT_BATCH_SIZE):
+    found = set()
+    for offset in range(0, len(ids), batch_size):
+        found.update(collection.get(ids=ids[offset:offset + batch_size], include=[])['ids'])
+    return found
+
+
+def existing_content_hashes(collection, hashes):
+    if not hashes:
+        return set()
+    existing = collection.get(where={"content_hash": {"$in": list(hashes)}}, include=["metadatas"])
+    return {metadata.get("content_hash") for metadata in existing['metadatas'] if metadata}
+
+
+def ingest_pdfs(jobs, collection_name="linkedin_profiles", workers=DEFAULT_WORKERS,
+                timeout=DEFAULT_FILE_TIMEOUT, batch_size=DEFAULT_BATCH_SIZE,
+                progress_callback=None, db_manager=None, log=print):
+    """Extract (name, path-or-bytes) resumes in parallel and write them to ChromaDB in batches.
+
+    Resumes whose bytes are already stored are skipped before parsing, and
+    resumes whose normalized text matches a stored one are skipped before
+    embedding. Resumes with less than MIN_RESUME_TEXT_LENGTH characters of
+    text count as failed, never as duplicates of each other. `progress_callback(done, total, name)` is called after every file.
+    """
+    jobs = list(jobs)
+    total = len(jobs)
+    db_manager = db_manager or get_db_manager()
+    db_manager.migrate_embeddings(collection_name, log=log)
+    collection = db_manager.get_collection(collection_name)
+    lexical_index = db_manager.lexical_index(collection_name)
+
+    processed = 0
+    failed = 0
+    duplicates = 0
+    done = 0
+    start = time.perf_counter()
+
+    def report(name):
+        if progress_callback:
+            progress_callback(done, total, name)
+
+    names = {}
+    for name, source in jobs:
+        try:
+            data = _read_bytes(source)
+        except Exception as e:
+            failed += 1
+            done += 1
+            log(f"  - Error reading {name}: {str(e)}")
+            report(name)
+            continue
+        file_hash = content_hash_bytes(data)
+        if file_hash in names:
+            duplicates += 1
+            done += 1
+            report(name)
+            continue
+        names[file_hash] = (name, data)
+
+    stored = existing_ids(collection, [pdf_profile_id(file_hash) for file_hash in names], batch_size)
+    to_extract = []
+    for file_hash, (name, data) in names.items():
+        if pdf_profile_id(file_hash) in stored:
+            duplicates += 1
+            done += 1
+            report(name)
+        else:
+            to_extract.append((file_hash, data, name))
+
+    ids, documents, metadatas = [], [], []
+    seen_text = set()
+
+    def flush():
+        nonlocal processed, failed, duplicates
+        if not ids:
+            return
+        stored_text = existing_content_hashes(collection, {metadata['content_hash'] for metadata in metadatas})
+        keep = [i for i, metadata in enumerate(metadatas) if metadata['content_hash'] not in stored_text]
+        duplicates += len(ids) - len(keep)
+        stats = upsert_in_batches(collection, [ids[i] for i in keep], [documents[i] for i in keep],
+                                  [metadatas[i] for i in keep], batch_size=batch_size, log=log,
+                                  lexical_index=lexical_index)
+        processed += stats['rows']
+        failed += stats['failed']
+        if stats['rows']:
+            db_manager.bump_version(collection_name)
+        del ids[:], documents[:], metadatas[:]
+
+    for file_hash, text, fields, error in extract_pdfs(to_extract, workers=workers, timeout=timeout):
+        done += 1
+        name = names[file_hash][0]
+        if error is None and len(normalize_resume_text(text or "")) < MIN_RESUME_TEXT_LENGTH:
+            error = "no extractable text (scanned or image-only PDF?)"
+        if error is not None:
+            failed += 1
+            log(f"  - Error processing {name}: {error}")
+        else:
+            profile_id, document, metadata = build_pdf_record(name, text, file_hash, fields)
+            if metadata['content_hash'] in seen_text:
+                duplicates += 1
+            else:
+                seen_text.add(metadata['content_hash'])
+                ids.append(profile_id)
+                documents.append(document)
+                metadatas.append(metadata)
+                if len(ids) >= batch_size:
+                    flush()
+        report(name)
+
+    flush()
+
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed if elapsed > 0 else float(done)
+    log(f"Ingested {processed} of {total} resumes in {elapsed:.2f}s ({rate:.1f} files/s), "
+        f"{duplicates} duplicates skipped, {failed} failed")
+    return {"processed": processed, "duplicates": duplicates, "failed": failed,
+            "seconds": elapsed, "files_per_second": rate}
@@ -0,0 +1,119 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+import numpy as np
+
+DEFAULT_CACHE_PATH = os.getenv("PROACQUIS_INTERPRETATION_CACHE", "data/interpretation_cache.sqlite")
+DEFAULT_TTL_SECONDS = float(os.getenv("PROACQUIS_INTERPRETATION_TTL", str(7 * 24 * 3600)))
+DEFAULT_SIMILARITY_THRESHOLD = float(os.getenv("PROACQUIS_INTERPRETATION_SIMILARITY", "0.97"))
+
+
+def normalize_query(query):
+    """Lowercase, drop punctuation and collapse whitespace so trivially different queries share a key"""
+    return " ".join(re.sub(r"[^\w+#/.-]+", " ", query.lower()).split()).strip(" .")
+
+
+class InterpretationCache:
+    """SQLite cache of HR query interpretations with TTL and optional near-duplicate lookup.
+
+    When an `embed` function is given, a miss on the exact normalized key
+    falls back to the stored query whose embedding has the highest cosine
+    similarity, if it clears `similarity_threshold`. With a `constraints`
+    function (e.g. query_filters.parse_constraints), only stored queries whose
+    constraints equal the new query's are considered: "Java Developer Delhi"
+    and "Java Developer Mumbai" embed almost identically but must not share
+    an interpretation.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_seconds=DEFAULT_TTL_SECONDS, embed=None,
+                 similarity_threshold=DEFAULT_SIMILARITY_THRESHOLD, constraints=None):
+        self.ttl_seconds = ttl_seconds
+        self.embed = embed
+        self.constraints = constraints
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS interpretations ("
+            "key TEXT PRIMARY KEY, query TEXT NOT NULL, interpretation TEXT NOT NULL, "
+            "embedding BLOB, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _embedding(self, key):
+        if self.embed is None:
+            return None
+        try:
+            return np.asarray(self.embed([key])[0], dtype=np.float32)
+        except Exception as e:
+            print(f"Interpretation cache: embedding failed, exact matching only: {str(e)}")
+            return None
+
+    def get(self, query):
+        key = normalize_query(query)
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            self._conn.execute("DELETE FROM interpretations WHERE created_at < ?", (cutoff,))
+            self._conn.commit()
+            row = self._conn.execute("SELECT interpretation FROM interpretations WHERE key = ?", (key,)).fetchone()
+            if row:
+                self.hits += 1
+                return row[0]
+
+            rows = self._conn.execute(
+                "SELECT query, interpretation, embedding FROM interpretations WHERE embedding IS NOT NULL").fetchall()
+
+        if rows and self.constraints is not None:
+            wanted = self.constraints(query)
+            rows = [row for row in rows if self.constraints(row[0]) == wanted]
+
+        # Only embed the query when some stored query could match it
+        if rows:
+            embedding = self._embedding(key)
+            # Vectors from a different embedding model have another size and are ignored
+            candidates = [(interpretation, np.frombuffer(blob, dtype=np.float32)) for _, interpretation, blob in rows]
+            candidates = [(interpretation, vector) for interpretation, vector in candidates
+                          if embedding is not None and vector.shape == embedding.shape]
+            if candidates:
+                stored = np.vstack([vector for _, vector in candidates])
+                norms = np.linalg.norm(stored, axis=1) * np.linalg.norm(embedding)
+                similarity = stored @ embedding / np.where(norms == 0, 1, norms)
+                best = int(np.argmax(similarity))
+                if similarity[best] >= self.similarity_threshold:
+                    with self._lock:
+                        self.hits += 1
+                        self.semantic_hits += 1
+                    return candidates[best][0]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, query, interpretation):
+        key = normalize_query(query)
+        embedding = self._embedding(key)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO interpretations VALUES (?, ?, ?, ?, ?)",
+                (key, query, interpretation, embedding.tobytes() if embedding is not None else None, time.time())
+            )
+            self._conn.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
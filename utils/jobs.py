@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_JOBS_PATH = os.getenv("PROACQUIS_JOBS_DB", "data/jobs.sqlite")
+# Stages wait on the LLM, embedding and search APIs, so threads overlap them well
+DEFAULT_JOB_WORKERS = int(os.getenv("PROACQUIS_JOB_WORKERS", "4"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+INTERRUPTED = "interrupted"
+FINISHED_STATES = (DONE, FAILED, INTERRUPTED)
+
+_COLUMNS = ("id", "session_id", "kind", "label", "status", "progress", "message", "result", "error",
+            "created_at", "started_at", "finished_at", "owner")
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class JobStore:
+    """SQLite table of background jobs, so progress and results outlive a browser refresh"""
+
+    def __init__(self, path=DEFAULT_JOBS_PATH):
+        # Host, pid and a start token, so a new process that reuses an old pid can tell its rows apart
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, session_id TEXT NOT NULL, kind TEXT NOT NULL, label TEXT NOT NULL, "
+            "status TEXT NOT NULL, progress REAL NOT NULL DEFAULT 0, message TEXT NOT NULL DEFAULT '', "
+            "result TEXT, error TEXT, created_at REAL NOT NULL, started_at REAL, finished_at REAL, owner TEXT)"
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")]
+        if "owner" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_session ON jobs(session_id, created_at)")
+        self._conn.commit()
+
+    def create(self, session_id, kind, label):
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, session_id, kind, label, status, created_at, owner) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, session_id, kind, label, QUEUED, time.time(), self.owner)
+            )
+            self._conn.commit()
+        return job_id
+
+    def update(self, job_id, **fields):
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"], default=str)
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", list(fields.values()) + [job_id])
+            self._conn.commit()
+
+    def _rows(self, where, params):
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE {where} ORDER BY created_at",
+                                      params).fetchall()
+        jobs = []
+        for row in rows:
+            job = dict(zip(_COLUMNS, row))
+            job["result"] = json.loads(job["result"]) if job["result"] else None
+            jobs.append(job)
+        return jobs
+
+    def get(self, job_id):
+        jobs = self._rows("id = ?", (job_id,))
+        return jobs[0] if jobs else None
+
+    def for_session(self, session_id):
+        return self._rows("session_id = ?", (session_id,))
+
+    def _is_stale(self, owner):
+        """True if the process that owns a job row is gone; rows from other hosts are left to them"""
+        if not owner:
+            return True
+        host, pid, token = owner.rsplit(":", 2)
+        if host != socket.gethostname():
+            return False
+        if int(pid) == os.getpid():
+            return owner != self.owner
+        return not _process_alive(int(pid))
+
+    def mark_interrupted(self):
+        """Jobs whose process has exited can never complete; say so instead of showing them as running.
+
+        The table may be shared with other live Streamlit processes or a main3
+        run, so only rows owned by a process that no longer exists are touched.
+        """
+        with self._lock:
+            owners = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT owner FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING))]
+            stale = [owner for owner in owners if self._is_stale(owner)]
+            if not stale:
+                return 0
+            named = [owner for owner in stale if owner]
+            placeholders = ", ".join("?" for _ in named) or "NULL"
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE status IN (?, ?) "
+                f"AND (owner IS NULL OR owner IN ({placeholders}))",
+                [INTERRUPTED, "The app restarted before this job finished", time.time(), QUEUED, RUNNING] + named
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def prune(self, max_age_seconds=7 * 24 * 3600):
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                               (time.time() - max_age_seconds,))
+            self._conn.commit()
+
+
+class JobRunner:
+    """Runs pipeline stages on a shared thread pool and records their progress in a JobStore.
+
+    A job function is called as fn(report, *args, **kwargs), where
+    report(fraction, message) updates the job's progress (fraction=None only
+    updates the message); whatever it returns (JSON-serialisable) becomes the
+    job result. Jobs from every session share the pool, so one recruiter's
+    long stage never blocks another's page.
+    """
+
+    def __init__(self, store=None, workers=DEFAULT_JOB_WORKERS):
+        self.store = store or JobStore()
+        interrupted = self.store.mark_interrupted()
+        if interrupted:
+            print(f"Marked {interrupted} unfinished jobs from a previous run as interrupted")
+        self.store.prune()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="proacquis-job")
+
+    def submit(self, session_id, kind, fn, *args, label=None, **kwargs):
+        job_id = self.store.create(session_id, kind, label or kind)
+        self._executor.submit(self._run, job_id, fn, args, kwargs)
+        return job_id
+
+    def _run(self, job_id, fn, args, kwargs):
+        self.store.update(job_id, status=RUNNING, started_at=time.time())
+
+        def report(fraction=None, message=""):
+            if fraction is None:
+                self.store.update(job_id, message=message)
+            else:
+                self.store.update(job_id, progress=max(0.0, min(1.0, float(fraction))), message=message)
+
+        try:
+            result = fn(report, *args, **kwargs)
+            self.store.update(job_id, status=DONE, progress=1.0, result=result, finished_at=time.time())
+        except Exception as e:
+            traceback.print_exc()
+            self.store.update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+
+    def jobs(self, session_id):
+        return self.store.for_session(session_id)
+
+    def active(self, session_id):
+        return [job for job in self.jobs(session_id) if job["status"] not in FINISHED_STATES]
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+_job_runner = None
+_job_runner_lock = threading.Lock()
+
+
+def get_job_runner():
+    """Process-wide runner shared by every Streamlit session"""
+    global _job_runner
+    with _job_runner_lock:
+        if _job_runner is None:
+            _job_runner = JobRunner()
+        return _job_runner
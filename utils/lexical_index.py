@@ -0,0 +1,116 @@
+import os
+import re
+import math
+import sqlite3
+import threading
+from collections import Counter
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+RRF_K = 60
+
+# Field labels appear in every profile document and carry no signal
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it of on or the to with
+name role location skills years experience achievements education certifications n
+""".split())
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+
+def tokenize(text):
+    """Lowercase terms that keep tech spellings intact (c++, c#, node.js)"""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+class LexicalIndex:
+    """BM25 inverted index over profile documents, stored in SQLite and updated per document"""
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS docs (id TEXT PRIMARY KEY, length INTEGER NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "term TEXT NOT NULL, doc_id TEXT NOT NULL, tf INTEGER NOT NULL, PRIMARY KEY (term, doc_id))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings(doc_id)")
+        self._conn.commit()
+
+    def _delete(self, ids):
+        for offset in range(0, len(ids), 500):
+            chunk = ids[offset:offset + 500]
+            placeholders = ",".join("?" * len(chunk))
+            self._conn.execute(f"DELETE FROM postings WHERE doc_id IN ({placeholders})", chunk)
+            self._conn.execute(f"DELETE FROM docs WHERE id IN ({placeholders})", chunk)
+
+    def upsert(self, ids, documents):
+        latest = dict(zip(ids, documents))
+        with self._lock:
+            self._delete(list(latest))
+            doc_rows, posting_rows = [], []
+            for doc_id, document in latest.items():
+                counts = Counter(tokenize(document or ""))
+                doc_rows.append((doc_id, sum(counts.values())))
+                posting_rows.extend((term, doc_id, tf) for term, tf in counts.items())
+            self._conn.executemany("INSERT INTO docs VALUES (?, ?)", doc_rows)
+            self._conn.executemany("INSERT INTO postings VALUES (?, ?, ?)", posting_rows)
+            self._conn.commit()
+
+    def delete(self, ids):
+        with self._lock:
+            self._delete(list(ids))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM postings")
+            self._conn.execute("DELETE FROM docs")
+            self._conn.commit()
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def search(self, query, top_k=20):
+        """Return [(doc_id, bm25_score)] for the best `top_k` documents containing any query term (all if None)"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        placeholders = ",".join("?" * len(terms))
+        with self._lock:
+            doc_count, total_length = self._conn.execute("SELECT COUNT(*), SUM(length) FROM docs").fetchone()
+            if not doc_count:
+                return []
+            document_frequency = dict(self._conn.execute(
+                f"SELECT term, COUNT(*) FROM postings WHERE term IN ({placeholders}) GROUP BY term", terms
+            ).fetchall())
+            rows = self._conn.execute(
+                f"SELECT p.term, p.doc_id, p.tf, d.length FROM postings p JOIN docs d ON d.id = p.doc_id "
+                f"WHERE p.term IN ({placeholders})", terms
+            ).fetchall()
+
+        average_length = (total_length or 0) / doc_count or 1.0
+        idf = {term: math.log(1 + (doc_count - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()}
+        scores = {}
+        for term, doc_id, tf, length in rows:
+            norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf[term] * tf * (BM25_K1 + 1) / norm
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked if top_k is None else ranked[:top_k]
+
+
+def reciprocal_rank_fusion(rankings, k=RRF_K):
+    """Fuse ranked id lists: score(id) = sum(1 / (k + rank)); returns [(id, score)] best first"""
+    scores = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
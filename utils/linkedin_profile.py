@@ -0,0 +1,91 @@
+from datetime import date
+from utils.skills import find_skills
+from utils.resume_parser import merged_months, find_locations
+
+
+def _text(value):
+    return " ".join(str(value).split()) if value else ""
+
+
+def _month_index(value, today):
+    """Month index for a {'year', 'month'} date; a missing or zero year means the role is ongoing"""
+    if not isinstance(value, dict) or not value.get("year"):
+        return today.year * 12 + today.month - 1
+    return int(value["year"]) * 12 + max(1, int(value.get("month") or 1)) - 1
+
+
+def _positions(payload):
+    return payload.get("position") or payload.get("fullPositions") or payload.get("experience") or []
+
+
+def _names(items, *keys):
+    names = []
+    for item in items or []:
+        value = item if isinstance(item, str) else next((item.get(key) for key in keys if item.get(key)), "")
+        value = _text(value)
+        if value and value not in names:
+            names.append(value)
+    return names
+
+
+def is_profile_payload(payload):
+    """Whether a RapidAPI 200 body is a profile; quota and error replies also come back as 200 {"message": ...}"""
+    return isinstance(payload, dict) and any(payload.get(key) for key in ("firstName", "lastName", "headline",
+                                                                          "username"))
+
+
+def linkedin_years_experience(payload, today=None):
+    today = today or date.today()
+    intervals = []
+    for position in _positions(payload):
+        start = position.get("start")
+        if not isinstance(start, dict) or not start.get("year"):
+            continue
+        start_month = _month_index(start, today)
+        end_month = _month_index(position.get("end"), today)
+        if end_month >= start_month:
+            intervals.append((start_month, end_month + 1))
+    return round(merged_months(intervals) / 12, 1)
+
+
+def flatten_linkedin_profile(payload, username, today=None):
+    """Reduce a RapidAPI LinkedIn payload to the spreadsheet profile fields, dropping URLs, ids and images"""
+    positions = _positions(payload)
+    name = _text(f"{payload.get('firstName') or ''} {payload.get('lastName') or ''}") or username
+
+    current = positions[0] if positions else {}
+    role = _text(current.get("title")) or _text(payload.get("headline")) or "N/A"
+
+    geo = payload.get("geo") or {}
+    location_text = " ".join(_text(value) for value in (geo.get("full"), geo.get("city"), geo.get("country"),
+                                                         payload.get("location")) if value)
+    locations = find_locations(location_text)
+    location = locations[0] if locations else _text(geo.get("city") or geo.get("full")) or "Unknown"
+
+    skills = _names(payload.get("skills"), "name")
+    free_text = "\n".join([_text(payload.get("headline")), _text(payload.get("summary"))] +
+                          [_text(position.get("description")) for position in positions])
+    for skill in find_skills(free_text):
+        if skill not in skills:
+            skills.append(skill)
+
+    education = []
+    for school in payload.get("educations") or payload.get("education") or []:
+        if isinstance(school, str):
+            school = {"schoolName": school}
+        degree = ", ".join(part for part in (_text(school.get("degree")), _text(school.get("fieldOfStudy"))) if part)
+        institution = _text(school.get("schoolName"))
+        entry = f"{degree} - {institution}" if degree and institution else degree or institution
+        if entry:
+            education.append(entry)
+
+    return {
+        "name": name,
+        "role": role,
+        "location": location,
+        "skills": ", ".join(skills) if skills else "N/A",
+        "years_experience": linkedin_years_experience(payload, today),
+        "achievements": "; ".join(_names(payload.get("honors"), "title", "name")) or "N/A",
+        "education": "; ".join(education) or "N/A",
+        "certifications": "; ".join(_names(payload.get("certifications"), "name")) or "N/A",
+    }
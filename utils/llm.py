@@ -0,0 +1,41 @@
+import os
+import time
+import threading
+
+DEFAULT_MODEL = "mistral/mistral-large-latest"
+
+_llms = {}
+_llm_lock = threading.Lock()
+_metrics = {"builds": 0, "reuses": 0, "build_seconds": 0.0}
+
+
+def current_model():
+    """Read at call time, so changing PROACQUIS_LLM_MODEL takes effect without a restart"""
+    return os.getenv("PROACQUIS_LLM_MODEL", DEFAULT_MODEL)
+
+
+def llm_config_key(model=None, **options):
+    return (model or current_model(),) + tuple(sorted(options.items()))
+
+
+def get_llm(model=None, **options):
+    """Return the process-wide ChatMistralAI for this model/options, so its HTTP connections stay warm"""
+    model = model or current_model()
+    key = llm_config_key(model, **options)
+    with _llm_lock:
+        llm = _llms.get(key)
+        if llm is not None:
+            _metrics["reuses"] += 1
+            return llm
+
+        start = time.perf_counter()
+        from langchain_mistralai.chat_models import ChatMistralAI
+        llm = ChatMistralAI(api_key=os.getenv("MISTRAL_API_KEY"), model=model, **options)
+        _metrics["builds"] += 1
+        _metrics["build_seconds"] += time.perf_counter() - start
+        _llms[key] = llm
+        return llm
+
+
+def llm_stats():
+    return dict(_metrics, clients=len(_llms))
@@ -0,0 +1,78 @@
+import io
+import os
+import time
+import multiprocessing
+from collections import deque
+import PyPDF2
+from utils.resume_parser import parse_resume
+
+DEFAULT_WORKERS = int(os.getenv("PROACQUIS_PDF_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+DEFAULT_FILE_TIMEOUT = float(os.getenv("PROACQUIS_PDF_TIMEOUT", "30"))
+
+
+def extract_pdf_text(source):
+    """Extract the text of a PDF given as a path, file object or raw bytes"""
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    pdf_reader = PyPDF2.PdfReader(source)
+    return "\n".join((page.extract_text() or "") for page in pdf_reader.pages)
+
+
+def _extract_job(job):
+    key, source, file_name = job
+    try:
+        text = extract_pdf_text(source)
+        return key, text, parse_resume(text, file_name), None
+    except Exception as e:
+        return key, None, None, str(e)
+
+
+def extract_pdfs(jobs, workers=DEFAULT_WORKERS, timeout=DEFAULT_FILE_TIMEOUT):
+    """Extract and parse (key, source, file_name) jobs in a process pool.
+
+    Yields (key, text, fields, error) as files finish, where `fields` holds
+    the profile metadata parsed from the resume by `parse_resume`.
+
+    At most `workers` files are in flight, so a file's wait time is its own
+    parse time. A file running longer than `timeout` seconds is reported as
+    failed and the pool is recycled to kill the stuck worker; the other
+    in-flight files are resubmitted.
+    """
+    queue = deque(jobs)
+    if not queue:
+        return
+
+    workers = max(1, min(int(workers), len(queue)))
+    context = multiprocessing.get_context("spawn")
+    pool = context.Pool(workers)
+    in_flight = []
+
+    try:
+        while queue or in_flight:
+            while queue and len(in_flight) < workers:
+                job = queue.popleft()
+                in_flight.append((job, pool.apply_async(_extract_job, (job,)), time.monotonic()))
+
+            still_running = []
+            for job, result, started in in_flight:
+                if result.ready():
+                    yield result.get()
+                else:
+                    still_running.append((job, result, started))
+
+            now = time.monotonic()
+            expired = [entry for entry in still_running if now - entry[2] > timeout]
+            if expired:
+                for job, _, _ in expired:
+                    yield job[0], None, None, f"Timed out after {timeout:.0f}s"
+                pool.terminate()
+                pool = context.Pool(workers)
+                for job, _, _ in reversed([entry for entry in still_running if entry not in expired]):
+                    queue.appendleft(job)
+                still_running = []
+
+            if len(still_running) == len(in_flight):
+                time.sleep(0.02)
+            in_flight = still_running
+    finally:
+        pool.terminate()
@@ -0,0 +1,107 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class StageSkipped(Exception):
+    """A stage did not run because one of its dependencies failed"""
+
+
+def stage_order(stages):
+    """Topological order of `stages` ({name: (fn, dependencies)}); raises ValueError on unknown or cyclic dependencies"""
+    for name, (_, dependencies) in stages.items():
+        for dependency in dependencies:
+            if dependency not in stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dependency}'")
+
+    order, visiting, done = [], set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Stage dependencies form a cycle through '{name}'")
+        visiting.add(name)
+        for dependency in stages[name][1]:
+            visit(dependency)
+        visiting.discard(name)
+        done.add(name)
+        order.append(name)
+
+    for name in stages:
+        visit(name)
+    return order
+
+
+def run_stages(stages, workers=None):
+    """Run a DAG of stages, each as soon as all of its dependencies have finished.
+
+    `stages` maps a name to (fn, dependencies); fn is called with a dict of
+    the results of its dependencies. Returns (results, timings), where
+    timings maps each stage that ran to {"start", "end", "thread"} relative to
+    the start of the run. If a stage raises, its dependents are skipped, the
+    remaining stages still run, and the first error is re-raised at the end
+    (as `error.timings` so the waterfall can still be printed).
+    """
+    order = stage_order(stages)
+    results, timings, errors = {}, {}, {}
+    run_start = time.perf_counter()
+
+    def run(name):
+        fn, dependencies = stages[name]
+        start = time.perf_counter() - run_start
+        try:
+            return fn({dependency: results[dependency] for dependency in dependencies})
+        finally:
+            timings[name] = {"start": start, "end": time.perf_counter() - run_start,
+                             "thread": threading.current_thread().name}
+
+    pending = list(order)
+    with ThreadPoolExecutor(max_workers=workers or len(stages) or 1, thread_name_prefix="stage") as executor:
+        in_flight = {}
+        while pending or in_flight:
+            for name in list(pending):
+                dependencies = stages[name][1]
+                if any(dependency in errors for dependency in dependencies):
+                    errors[name] = StageSkipped(f"Skipped '{name}' because a dependency failed")
+                    pending.remove(name)
+                elif all(dependency in results for dependency in dependencies):
+                    in_flight[executor.submit(run, name)] = name
+                    pending.remove(name)
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = in_flight.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    print(f"Stage '{name}' failed: {str(e)}")
+                    errors[name] = e
+
+    failures = [errors[name] for name in order if name in errors and not isinstance(errors[name], StageSkipped)]
+    if failures:
+        failures[0].timings = timings
+        raise failures[0]
+    return results, timings
+
+
+def waterfall(timings, width=40):
+    """Text timing chart of a run_stages() result, one bar per stage in start order"""
+    if not timings:
+        return "No stages ran."
+
+    total = max(timing["end"] for timing in timings.values()) or 1e-9
+    busy = sum(timing["end"] - timing["start"] for timing in timings.values())
+    label_width = max(len(name) for name in timings)
+    lines = [f"Pipeline waterfall ({total:.2f}s wall, {busy:.2f}s of stage time):"]
+    for name, timing in sorted(timings.items(), key=lambda item: item[1]["start"]):
+        first = min(width - 1, int(timing["start"] / total * width))
+        last = max(first + 1, int(round(timing["end"] / total * width)))
+        bar = " " * first + "#" * (last - first) + " " * (width - last)
+        lines.append(f"  {name:<{label_width}} |{bar}| {timing['start']:6.2f}s -> {timing['end']:6.2f}s "
+                     f"({timing['end'] - timing['start']:.2f}s)")
+    if busy > total:
+        lines.append(f"  Running stages concurrently saved {busy - total:.2f}s over a sequential run")
+    return "\n".join(lines)
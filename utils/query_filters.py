@@ -0,0 +1,93 @@
+import re
+from utils.resume_parser import find_locations
+
+_RANGE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(?:-|–|to)\s*(\d+(?:\.\d+)?)\s*(?:years|yrs)", re.IGNORECASE)
+_MIN_PATTERN = re.compile(
+    r"(?:(\d+(?:\.\d+)?)\s*\+\s*(?:years|yrs)|(?:at least|minimum(?: of)?|min\.?|over|more than)\s*"
+    r"(\d+(?:\.\d+)?)\s*(?:years|yrs))",
+    re.IGNORECASE
+)
+_MAX_PATTERN = re.compile(
+    r"(?:at most|maximum(?: of)?|max\.?|under|less than|up to)\s*(\d+(?:\.\d+)?)\s*(?:years|yrs)",
+    re.IGNORECASE
+)
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return [v for v in value if v]
+    return [value] if value else []
+
+
+def build_where(location=None, role=None, min_years=None, max_years=None, source=None):
+    """Translate structured constraints into a ChromaDB `where` filter (None when unconstrained).
+
+    `location`, `role` and `source` take a value or a list of accepted values.
+    Years bounds compare against the numeric `years_experience` field.
+    """
+    clauses = []
+    for field, value in (("location", location), ("role", role), ("source", source)):
+        values = _as_list(value)
+        if len(values) == 1:
+            clauses.append({field: {"$eq": values[0]}})
+        elif values:
+            clauses.append({field: {"$in": values}})
+
+    if min_years is not None:
+        clauses.append({"years_experience": {"$gte": float(min_years)}})
+    if max_years is not None:
+        clauses.append({"years_experience": {"$lte": float(max_years)}})
+
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+
+def parse_constraints(text):
+    """Pull location and years-of-experience constraints out of free text like 'Delhi, 5+ years'"""
+    constraints = {}
+
+    locations = [location for location in find_locations(text) if location != "Remote"]
+    if locations:
+        constraints["location"] = locations if len(locations) > 1 else locations[0]
+
+    range_match = _RANGE_PATTERN.search(text)
+    if range_match:
+        constraints["min_years"] = float(range_match.group(1))
+        constraints["max_years"] = float(range_match.group(2))
+    else:
+        min_match = _MIN_PATTERN.search(text)
+        if min_match:
+            constraints["min_years"] = float(min_match.group(1) or min_match.group(2))
+        max_match = _MAX_PATTERN.search(text)
+        if max_match:
+            constraints["max_years"] = float(max_match.group(1))
+
+    return constraints
+
+
+def describe_filters(filters):
+    if not filters:
+        return "none"
+    parts = []
+    for key in ("location", "role", "source"):
+        if filters.get(key):
+            values = _as_list(filters[key])
+            parts.append(f"{key} in {', '.join(values)}" if len(values) > 1 else f"{key} = {values[0]}")
+    if filters.get("min_years") is not None:
+        parts.append(f"years >= {filters['min_years']:g}")
+    if filters.get("max_years") is not None:
+        parts.append(f"years <= {filters['max_years']:g}")
+    return "; ".join(parts) or "none"
+
+
+def resolve_filters(query, location=None, role=None, min_years=None, max_years=None, source=None):
+    """Explicit constraints when any are given, otherwise whatever `parse_constraints` finds in the query"""
+    explicit = {key: value for key, value in (("location", location), ("role", role), ("min_years", min_years),
+                                              ("max_years", max_years), ("source", source))
+                if value not in (None, "", [])}
+    return explicit or parse_constraints(query)
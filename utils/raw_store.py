@@ -0,0 +1,42 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+
+DEFAULT_RAW_STORE_PATH = os.getenv("PROACQUIS_RAW_STORE", "data/raw_payloads.sqlite")
+
+
+class RawPayloadStore:
+    """zlib-compressed JSON payloads keyed by (source, id), kept out of the vector index"""
+
+    def __init__(self, path=DEFAULT_RAW_STORE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS payloads ("
+            "source TEXT NOT NULL, id TEXT NOT NULL, payload BLOB NOT NULL, fetched_at REAL NOT NULL, "
+            "PRIMARY KEY (source, id))"
+        )
+        self._conn.commit()
+
+    def put_many(self, source, items):
+        """Store {id: payload} for `source`, replacing older copies"""
+        now = time.time()
+        rows = [(source, item_id, zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 6), now)
+                for item_id, payload in items.items()]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO payloads VALUES (?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def get(self, source, item_id):
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM payloads WHERE source = ? AND id = ?",
+                                     (source, item_id)).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
@@ -0,0 +1,67 @@
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from utils.interpretation_cache import normalize_query
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("PROACQUIS_RESULT_CACHE_SIZE", "512"))
+# Writes from another process (e.g. main3 while the app runs) don't bump this process's versions,
+# so entries also expire after a while
+DEFAULT_TTL_SECONDS = float(os.getenv("PROACQUIS_RESULT_CACHE_TTL", "600"))
+
+
+def result_key(kind, query, filters=None, top_k=None, version=0, context=None):
+    """Cache key for a search result; equivalent filters in any order give the same key"""
+    return (kind, normalize_query(query), json.dumps(filters or {}, sort_keys=True, default=str), top_k, version,
+            context)
+
+
+class ResultCache:
+    """In-memory LRU of formatted search results; the collection version in each key makes stale hits impossible"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[1] > self.ttl_seconds:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute, cacheable=lambda value: True):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None and cacheable(value):
+                self.put(key, value)
+        return value
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries),
+                "hit_rate": self.hits / total if total else 0.0}
+
+
+_result_cache = ResultCache()
+
+
+def get_result_cache():
+    return _result_cache
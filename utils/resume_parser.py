@@ -0,0 +1,204 @@
+import re
+from datetime import date
+from utils.skills import find_skills
+
+SECTION_HEADINGS = {
+    "summary": ["summary", "profile", "professional summary", "about me", "objective", "career objective"],
+    "experience": ["experience", "work experience", "professional experience", "employment history",
+                   "work history", "employment", "career history"],
+    "education": ["education", "academic background", "academics", "qualifications",
+                  "educational qualifications"],
+    "skills": ["skills", "technical skills", "core competencies", "key skills", "technologies", "tech stack"],
+    "projects": ["projects", "personal projects", "academic projects"],
+    "certifications": ["certifications", "certificates", "licenses & certifications"],
+    "achievements": ["achievements", "awards", "honors", "accomplishments"],
+}
+
+KNOWN_LOCATIONS = ["Delhi", "New Delhi", "Mumbai", "Pune", "Hyderabad", "Chennai", "Bangalore", "Bengaluru",
+                   "Ahmedabad", "Kolkata", "Noida", "Gurgaon", "Gurugram", "Jaipur", "Kochi", "Indore",
+                   "Chandigarh", "New York", "San Francisco", "Seattle", "London", "Paris", "Berlin",
+                   "Singapore", "Toronto", "Remote"]
+
+_LOCATION_ALIASES = {"new delhi": "Delhi", "bengaluru": "Bangalore", "gurugram": "Gurgaon"}
+
+_MONTHS = {name: index + 1 for index, names in enumerate([
+    ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"), ("may",),
+    ("jun", "june"), ("jul", "july"), ("aug", "august"), ("sep", "sept", "september"),
+    ("oct", "october"), ("nov", "november"), ("dec", "december")]) for name in names}
+
+_heading_to_section = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+_HEADING_PATTERN = re.compile(
+    r"^\s*(" + "|".join(re.escape(h) for h in sorted(_heading_to_section, key=len, reverse=True)) + r")\s*:?\s*$",
+    re.IGNORECASE
+)
+
+_MONTH_NAMES = "|".join(sorted(_MONTHS, key=len, reverse=True))
+_DATE = rf"(?:(?:{_MONTH_NAMES})\.?\s+\d{{4}}|\d{{1,2}}\s*/\s*\d{{4}}|\d{{4}})"
+_DATE_RANGE_PATTERN = re.compile(
+    rf"({_DATE})\s*(?:-|–|—|to|till|until)\s*({_DATE}|present|current|now|today|date)",
+    re.IGNORECASE
+)
+_YEARS_PHRASE_PATTERN = re.compile(r"(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years|yrs)(?:\s+of)?\s+(?:\w+\s+){0,2}experience",
+                                   re.IGNORECASE)
+_ROLE_PATTERN = re.compile(
+    r"\b((?:senior|junior|lead|principal|staff|chief|head|sr\.?|jr\.?)[ \t]+)?"
+    r"((?:[A-Za-z+#/.-]+[ \t]+){0,3}?"
+    r"(?:engineer|developer|architect|scientist|analyst|manager|designer|administrator|consultant|programmer|intern))\b",
+    re.IGNORECASE
+)
+_DEGREE_PATTERN = re.compile(
+    r"\b(b\.?\s?tech|m\.?\s?tech|b\.?e\.?|m\.?e\.?|b\.?sc|m\.?sc|bca|mca|mba|ph\.?d|b\.?s\.?|m\.?s\.?|"
+    r"bachelor(?:'s)?|master(?:'s)?|doctorate)\b[^\n]{0,80}",
+    re.IGNORECASE
+)
+_LOCATION_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(loc) for loc in sorted(KNOWN_LOCATIONS, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE
+)
+_NAME_LINE_PATTERN = re.compile(r"^[A-Za-z][A-Za-z .'-]{1,60}$")
+
+
+def split_sections(text):
+    """Split resume text into {section: text} using common heading lines; preamble goes to 'header'"""
+    sections = {"header": []}
+    current = "header"
+    for line in text.splitlines():
+        match = _HEADING_PATTERN.match(line)
+        if match:
+            current = _heading_to_section[match.group(1).lower()]
+            sections.setdefault(current, [])
+            continue
+        sections.setdefault(current, []).append(line)
+    return {section: "\n".join(lines) for section, lines in sections.items()}
+
+
+def _parse_date(value, today):
+    value = value.strip().lower().rstrip(".")
+    if value in ("present", "current", "now", "today", "date"):
+        return today.year * 12 + today.month - 1
+    parts = re.split(r"[\s/.]+", value)
+    if len(parts) == 2:
+        month = _MONTHS.get(parts[0]) or (int(parts[0]) if parts[0].isdigit() else None)
+        year = int(parts[1])
+    else:
+        month, year = 1, int(parts[0])
+    if not month or not 1 <= month <= 12 or not 1950 <= year <= today.year + 1:
+        return None
+    return year * 12 + month - 1
+
+
+def experience_years(text, today=None):
+    """Total years covered by date ranges in `text`, merging overlapping roles"""
+    today = today or date.today()
+    intervals = []
+    for start_text, end_text in _DATE_RANGE_PATTERN.findall(text):
+        start = _parse_date(start_text, today)
+        end = _parse_date(end_text, today)
+        if start is None or end is None or end < start:
+            continue
+        # A bare "2019 - 2021" covers through the end of the final year
+        if re.fullmatch(r"\d{4}", end_text.strip()):
+            end += 11
+        intervals.append((start, end + 1))
+
+    stated = [float(value) for value in _YEARS_PHRASE_PATTERN.findall(text)]
+    return round(max([merged_months(intervals) / 12] + stated), 1)
+
+
+def merged_months(intervals):
+    """Months covered by (start, end) month-index intervals, counting overlaps once"""
+    months = 0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                months += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        months += current_end - current_start
+    return months
+
+
+def _first_line(text):
+    for line in text.splitlines():
+        line = line.strip(" \t•-*|")
+        if line:
+            return line
+    return ""
+
+
+def guess_name(header, fallback):
+    for line in header.splitlines()[:5]:
+        line = line.strip()
+        if line and _NAME_LINE_PATTERN.match(line) and 1 < len(line.split()) <= 4 \
+                and all(word[0].isupper() for word in line.split()) \
+                and not _ROLE_PATTERN.search(line) and not _LOCATION_PATTERN.fullmatch(line):
+            return line.title() if line.isupper() else line
+    return fallback
+
+
+def guess_role(sections):
+    for section in ("header", "summary", "experience"):
+        match = _ROLE_PATTERN.search(sections.get(section, ""))
+        if match:
+            return " ".join(match.group(0).split()).title()
+    return "N/A"
+
+
+def canonical_location(name):
+    name = name.lower()
+    return _LOCATION_ALIASES.get(name) or next(known for known in KNOWN_LOCATIONS if known.lower() == name)
+
+
+def find_locations(text):
+    """Known locations mentioned in `text`, canonicalized, in order of first mention"""
+    locations = []
+    for match in _LOCATION_PATTERN.finditer(text):
+        location = canonical_location(match.group(1))
+        if location not in locations:
+            locations.append(location)
+    return locations
+
+
+def guess_location(text):
+    labelled = re.search(r"(?:location|address|based in)\s*:?\s*([^\n]+)", text, re.IGNORECASE)
+    for candidate in ([labelled.group(1)] if labelled else []) + [text[:1500], text]:
+        match = _LOCATION_PATTERN.search(candidate)
+        if match:
+            return canonical_location(match.group(1))
+    return "Unknown"
+
+
+def guess_education(sections):
+    for text in (sections.get("education", ""), "\n".join(sections.values())):
+        match = _DEGREE_PATTERN.search(text)
+        if match:
+            return " ".join(match.group(0).split()).strip(" ,;|")
+    first = _first_line(sections.get("education", ""))
+    return first or "N/A"
+
+
+def parse_resume(text, file_name="", today=None):
+    """Extract the spreadsheet profile fields (name, role, location, skills, years, education) from resume text"""
+    sections = split_sections(text)
+    fallback_name = file_name.rsplit('.', 1)[0] if file_name else "Unknown"
+
+    skills_text = sections.get("skills", "")
+    skills = find_skills(skills_text) if skills_text.strip() else []
+    for skill in find_skills(text):
+        if skill not in skills:
+            skills.append(skill)
+
+    experience_text = sections.get("experience") or "\n".join(
+        body for section, body in sections.items() if section != "education")
+
+    return {
+        "name": guess_name(sections.get("header", ""), fallback_name),
+        "role": guess_role(sections),
+        "location": guess_location(text),
+        "skills": ", ".join(skills) if skills else "N/A",
+        "years_experience": experience_years(experience_text, today),
+        "education": guess_education(sections),
+    }
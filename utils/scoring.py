@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from utils.skills import SkillMatcher, candidate_skill_tokens
+
+MAX_EXPERIENCE_SCORE = 40
+MAX_SKILL_SCORE = 60
+POINTS_PER_YEAR = 8
+POINTS_PER_SKILL = 5
+
+RECOMMENDATIONS = [
+    (80, "Highly Recommended"),
+    (60, "Recommended"),
+    (40, "Consider for Interview"),
+]
+
+
+def recommendation_for(score):
+    for threshold, label in RECOMMENDATIONS:
+        if score >= threshold:
+            return label
+    return "Not Recommended"
+
+
+def score_candidates(job_description, ids, metadatas, distances=None, similarity_weight=0.0, matcher=None):
+    """Score a whole candidate pool at once and return it ranked as a DataFrame.
+
+    The rule-based score is the same as the per-candidate screener
+    (experience up to 40, skill matches up to 60). When `distances` are
+    given, `similarity_weight` of the final score comes from vector
+    similarity rescaled to 0-100 within the pool.
+    """
+    matcher = matcher or SkillMatcher(job_description)
+    metadatas = [metadata or {} for metadata in metadatas]
+    frame = pd.DataFrame(metadatas, index=pd.Index(ids, name="id"))
+    if frame.empty:
+        return frame
+
+    years_column = frame["years_experience"] if "years_experience" in frame else pd.Series(0, index=frame.index)
+    years = pd.to_numeric(years_column, errors="coerce").fillna(0).to_numpy(dtype=float)
+    experience_score = np.minimum(MAX_EXPERIENCE_SCORE, (years * POINTS_PER_YEAR).astype(int))
+
+    tokens = pd.Series([candidate_skill_tokens(metadata) for metadata in metadatas], index=frame.index)
+    exploded = tokens.explode()
+    hits = exploded[exploded.isin(matcher.terms)]
+    matched = hits.groupby(level=0).agg(lambda skills: ", ".join(sorted(skills)))
+    match_count = hits.groupby(level=0).size().reindex(frame.index, fill_value=0).to_numpy()
+    skill_score = np.minimum(MAX_SKILL_SCORE, POINTS_PER_SKILL * match_count)
+
+    rule_score = experience_score + skill_score
+
+    if distances is not None and similarity_weight > 0:
+        distances = np.asarray(distances, dtype=float)
+        spread = distances.max() - distances.min()
+        similarity = 1.0 - (distances - distances.min()) / spread if spread > 0 else np.ones_like(distances)
+        final_score = (1 - similarity_weight) * rule_score + similarity_weight * 100 * similarity
+    else:
+        similarity = np.full(len(frame), np.nan)
+        final_score = rule_score.astype(float)
+
+    frame["experience_score"] = experience_score
+    frame["skill_score"] = skill_score
+    frame["matched_skills"] = matched.reindex(frame.index).fillna("")
+    frame["similarity"] = similarity
+    frame["score"] = np.round(final_score, 1)
+    frame["recommendation"] = np.select(
+        [frame["score"] >= threshold for threshold, _ in RECOMMENDATIONS],
+        [label for _, label in RECOMMENDATIONS],
+        default="Not Recommended"
+    )
+
+    return frame.sort_values("score", ascending=False, kind="stable")
@@ -0,0 +1,170 @@
+import re
+
+# Canonical skill name -> alternative spellings found in resumes and job descriptions
+SKILL_ALIASES = {
+    "Python": ["python", "python3"],
+    "Java": ["java", "core java", "java ee", "j2ee"],
+    "JavaScript": ["javascript", "JS", "ecmascript", "es6"],
+    "TypeScript": ["typescript"],
+    "C": ["C"],
+    "C++": ["c++", "cpp"],
+    "C#": ["C#", "csharp", "c sharp"],
+    "Embedded C": ["embedded c"],
+    "Go": ["golang", "Go"],
+    "Rust": ["rust"],
+    "R": ["R"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["swift"],
+    "SQL": ["sql", "mysql", "postgresql", "postgres", "sqlite", "t-sql", "pl/sql"],
+    "NoSQL": ["nosql", "mongodb", "mongo", "cassandra", "dynamodb"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3", "sass", "scss"],
+    "Bootstrap": ["bootstrap"],
+    "React": ["react", "react.js", "reactjs"],
+    "React Native": ["react native"],
+    "Angular": ["angular", "angularjs"],
+    "Vue": ["vue", "vue.js", "vuejs"],
+    "Node.js": ["node.js", "nodejs", "node js"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "FastAPI": ["fastapi"],
+    "Spring": ["spring boot", "springboot", "spring framework"],
+    "Flutter": ["flutter"],
+    "Docker": ["docker"],
+    "Kubernetes": ["kubernetes", "k8s", "cka"],
+    "Terraform": ["terraform"],
+    "AWS": ["aws", "amazon web services"],
+    "Azure": ["azure", "microsoft azure"],
+    "GCP": ["gcp", "google cloud", "google cloud platform"],
+    "Linux": ["linux", "unix", "bash"],
+    "Git": ["git", "github", "gitlab"],
+    "CI/CD": ["ci/cd", "jenkins", "github actions", "continuous integration"],
+    "Agile": ["agile", "scrum", "kanban"],
+    "Software Design": ["software design", "system design", "design patterns"],
+    "Network Security": ["network security", "firewalls", "penetration testing", "ethical hacking"],
+    "RTOS": ["rtos", "freertos", "real-time operating systems"],
+    "Figma": ["figma"],
+    "Sketch": ["sketch"],
+    "Adobe XD": ["adobe xd"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "Matplotlib": ["matplotlib"],
+    "scikit-learn": ["scikit-learn", "sklearn", "scikit learn"],
+    "TensorFlow": ["tensorflow"],
+    "PyTorch": ["pytorch"],
+    "Machine Learning": ["machine learning", "ML"],
+    "Deep Learning": ["deep learning"],
+    "Neural Networks": ["neural networks", "neural network", "cnn", "rnn"],
+    "NLP": ["nlp", "natural language processing"],
+    "Unreal Engine": ["unreal engine", "unreal", "ue4", "ue5"],
+    "Unity": ["unity3d", "unity engine"],
+    "Game Design": ["game design"],
+    "3D Modeling": ["3d modeling", "3d modelling", "blender", "maya"],
+}
+
+# Aliases this short are matched case-sensitively so "R", "C" and "Go" do not fire on prose
+# ("go", "r&d"). Canonical names this short are not aliases of themselves: list them explicitly.
+_SHORT_ALIAS_LENGTH = 2
+
+
+def _build_pattern(aliases, flags, trailing=""):
+    alternatives = sorted(aliases, key=len, reverse=True)
+    body = "|".join(re.escape(alias) for alias in alternatives)
+    return re.compile(rf"(?<![\w+#./-])({body})(?![\w+#{re.escape(trailing)}]|\.\w|&)", flags)
+
+
+_ALIAS_TO_SKILL = {}
+_short_aliases = []
+_long_aliases = []
+for _skill, _aliases in SKILL_ALIASES.items():
+    for _alias in set(_aliases + ([_skill] if len(_skill) > _SHORT_ALIAS_LENGTH else [])):
+        if len(_alias) <= _SHORT_ALIAS_LENGTH:
+            _ALIAS_TO_SKILL[_alias] = _skill
+            _short_aliases.append(_alias)
+        else:
+            _ALIAS_TO_SKILL[_alias.lower()] = _skill
+            _long_aliases.append(_alias.lower())
+
+# ...and not when hyphenated, as in "Go-getter" or "C-suite"
+_SHORT_PATTERN = _build_pattern(set(_short_aliases), 0, trailing="-")
+_LONG_PATTERN = _build_pattern(set(_long_aliases), re.IGNORECASE)
+
+
+def find_skills(text):
+    """Canonical skills mentioned in `text`, in order of first mention
+
+    >>> find_skills("Backend services in Go and Python, some golang tooling")
+    ['Go', 'Python']
+    >>> find_skills("A go-getter ready to go the extra mile in C-suite R&D")
+    []
+    """
+    found = {}
+    for match in _LONG_PATTERN.finditer(text):
+        found.setdefault(_ALIAS_TO_SKILL[match.group(1).lower()], match.start())
+    for match in _SHORT_PATTERN.finditer(text):
+        skill = _ALIAS_TO_SKILL[match.group(1)]
+        found[skill] = min(found.get(skill, match.start()), match.start())
+    return sorted(found, key=found.get)
+
+
+_STOPWORDS = {
+    "and", "the", "with", "for", "from", "into", "that", "this", "have", "has", "will", "are", "our", "you",
+    "your", "who", "can", "able", "years", "year", "experience", "experienced", "strong", "good", "knowledge",
+    "skills", "skill", "role", "team", "work", "working", "looking", "candidate", "candidates", "required",
+    "requirements", "preferred", "plus", "least", "must", "should", "senior", "junior", "lead", "level",
+    "engineer", "developer", "position", "job",
+}
+_WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def normalize_skill(name):
+    """Canonical lowercase key for a skill name, resolving known aliases"""
+    name = " ".join(name.strip().split())
+    skill = _ALIAS_TO_SKILL.get(name) or _ALIAS_TO_SKILL.get(name.lower())
+    return (skill or name).lower()
+
+
+def skill_tokens(skills):
+    """Normalized skill keys for a comma separated skills field"""
+    if not skills or skills == "N/A":
+        return set()
+    return {normalize_skill(entry) for entry in re.split(r"[,;|\n]", skills) if entry.strip()}
+
+
+def skill_tokens_string(skills):
+    """Serialized form of `skill_tokens` stored in ChromaDB metadata at ingest time"""
+    return ",".join(sorted(skill_tokens(skills)))
+
+
+def candidate_skill_tokens(metadata):
+    stored = metadata.get("skill_tokens")
+    if stored is not None:
+        return set(stored.split(",")) if stored else set()
+    return skill_tokens(metadata.get("skills", ""))
+
+
+class SkillMatcher:
+    """Job description compiled once into a set of normalized skill terms.
+
+    Terms are the lexicon skills mentioned in the description (so aliases
+    like "k8s" resolve to Kubernetes) plus its 1-3 word phrases, which lets
+    skills outside the lexicon match exactly rather than by substring.
+    """
+
+    def __init__(self, job_description):
+        self.job_description = job_description
+        self.lexicon_skills = {skill.lower() for skill in find_skills(job_description)}
+
+        words = _WORD_PATTERN.findall(job_description.lower())
+        phrases = set()
+        for size in (1, 2, 3):
+            for i in range(len(words) - size + 1):
+                phrase = words[i:i + size]
+                if size == 1 and (len(phrase[0]) <= 3 or phrase[0] in _STOPWORDS):
+                    continue
+                phrases.add(normalize_skill(" ".join(phrase)))
+        self.terms = frozenset(self.lexicon_skills | phrases)
+
+    def matches(self, candidate_tokens):
+        """Skill keys shared by the job description and a candidate's token set"""
+        return self.terms & candidate_tokens
@@ -0,0 +1,70 @@
+"""Cold-start import benchmark.
+
+    python -m utils.startup                      # main3 and tasks.hr_tasks
+    python -m utils.startup app2 --budget 3      # exit 1 if any target is over budget
+
+Each target is imported in a fresh interpreter with `-X importtime`, so the
+numbers are what a new container or CLI run pays.
+"""
+import os
+import re
+import sys
+import argparse
+import subprocess
+
+DEFAULT_TARGETS = ["main3", "tasks.hr_tasks"]
+DEFAULT_BUDGET_SECONDS = float(os.getenv("PROACQUIS_STARTUP_BUDGET", "2.0"))
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( +)(\S+)")
+
+
+def import_time_breakdown(module, cwd=None):
+    """Import `module` in a fresh interpreter and return (total_seconds, [(package, seconds)]) for its direct imports"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd or os.getcwd(), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    # Children are printed before their parent, indented by two extra spaces per level
+    total, breakdown = 0.0, []
+    pending = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        depth = (len(match.group(3)) - 1) // 2
+        entry = (match.group(4), int(match.group(2)) / 1e6)
+        children = pending.pop(depth + 1, [])
+        if entry[0] == module:
+            total += entry[1]
+            breakdown.extend(children)
+        pending.setdefault(depth, []).append(entry)
+
+    return total, sorted(breakdown, key=lambda entry: entry[1], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start import time")
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_SECONDS,
+                        help="Seconds each target may take to import")
+    parser.add_argument("--top", type=int, default=10, help="Slowest direct imports to list")
+    args = parser.parse_args(argv)
+
+    over_budget = []
+    for target in args.targets:
+        total, breakdown = import_time_breakdown(target)
+        status = "OK" if total <= args.budget else "OVER BUDGET"
+        print(f"{target}: {total:.3f}s ({status}, budget {args.budget:.1f}s)")
+        for package, seconds in breakdown[:args.top]:
+            print(f"  {seconds:7.3f}s  {package}")
+        if total > args.budget:
+            over_budget.append(target)
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
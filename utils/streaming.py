@@ -0,0 +1,115 @@
+import time
+import queue
+import threading
+
+# Re-rendering a Streamlit placeholder per token is slower than the tokens arrive
+DEFAULT_REFRESH_SECONDS = 0.05
+
+_metrics = {"ttft": [], "total": []}
+
+
+def _record(kind, seconds):
+    samples = _metrics[kind]
+    samples.append(seconds)
+    if len(samples) > 1000:
+        del samples[:len(samples) - 1000]
+
+
+def streaming_summary():
+    """Mean/max/count in milliseconds for time-to-first-token and full answer time"""
+    summary = {}
+    for kind, samples in _metrics.items():
+        if samples:
+            summary[kind] = {"count": len(samples), "mean_ms": sum(samples) / len(samples) * 1000,
+                             "max_ms": max(samples) * 1000}
+        else:
+            summary[kind] = {"count": 0, "mean_ms": 0.0, "max_ms": 0.0}
+    return summary
+
+
+def _supports_streaming(crew):
+    return "stream" in type(crew).model_fields
+
+
+def _describe_step(step):
+    """One progress line for a step_callback payload (AgentAction, ToolResult, AgentFinish...)"""
+    tool = getattr(step, "tool", None)
+    if tool:
+        return f"Using tool: {tool}"
+    if getattr(step, "result", None) is not None:
+        return "Tool finished"
+    return None
+
+
+def stream_crew(crew, on_update, refresh_seconds=DEFAULT_REFRESH_SECONDS):
+    """Run `crew`, calling on_update(text, status) as output arrives; returns (answer, timings).
+
+    Crews that support `stream=True` deliver LLM tokens and tool calls as they
+    are generated. Older crewai versions only report finished agent steps, so
+    there the status line shows tool progress and the text arrives at the end.
+    `timings` holds ttft (seconds to the first answer text) and total.
+    """
+    start = time.perf_counter()
+    timings = {"ttft": None, "total": None}
+
+    if _supports_streaming(crew):
+        # Crew streaming switches stream on for every agent's LLM; put it back so later
+        # (non-streaming) crews on the same agents are unaffected
+        llm_stream_flags = [(agent.llm, getattr(agent.llm, "stream", None)) for agent in crew.agents]
+        crew.stream = True
+        text, status, last_render = "", "Thinking...", 0.0
+        try:
+            streaming = crew.kickoff()
+            for chunk in streaming:
+                tool_call = getattr(chunk, "tool_call", None)
+                if tool_call is not None and tool_call.tool_name:
+                    status = f"Using tool: {tool_call.tool_name}"
+                elif chunk.content:
+                    if timings["ttft"] is None:
+                        timings["ttft"] = time.perf_counter() - start
+                    text += chunk.content
+                    status = "Answering..."
+                now = time.perf_counter()
+                if now - last_render >= refresh_seconds:
+                    on_update(text, status)
+                    last_render = now
+        finally:
+            for llm, flag in llm_stream_flags:
+                if flag is not None:
+                    llm.stream = flag
+        answer = str(streaming.result)
+        if timings["ttft"] is None:
+            timings["ttft"] = time.perf_counter() - start
+    else:
+        steps = queue.Queue()
+        outcome = {}
+        crew.step_callback = steps.put
+
+        def run():
+            try:
+                outcome["answer"] = str(crew.kickoff())
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                steps.put(None)
+
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        while True:
+            step = steps.get()
+            if step is None:
+                break
+            status = _describe_step(step)
+            if status:
+                on_update("", status)
+        worker.join()
+        if "error" in outcome:
+            raise outcome["error"]
+        answer = outcome["answer"]
+        timings["ttft"] = time.perf_counter() - start
+
+    timings["total"] = time.perf_counter() - start
+    on_update(answer, None)
+    _record("ttft", timings["ttft"])
+    _record("total", timings["total"])
+    return answer, timings